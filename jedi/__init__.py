@@ -36,7 +36,10 @@ from jedi.api.environment import find_virtualenvs, find_system_environments, \
     get_default_environment, InvalidPythonEnvironment, create_environment, \
     get_system_environment, InterpreterEnvironment
 from jedi.api.project import Project, get_default_project
-from jedi.api.exceptions import InternalError, RefactoringError
+from jedi.api.session import Session
+from jedi.api.classes import resolve_types, resolve_docstrings
+from jedi.api.exceptions import InternalError, RefactoringError, CancelledError
+from jedi.api.cancellation import CancellationToken
 
 # Finally load the internal plugins. This is only internal.
 from jedi.plugins import registry
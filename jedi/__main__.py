@@ -40,6 +40,65 @@ def _start_linter():
                 raise
 
 
+def _get_python_files(args):
+    for path in args:
+        if path.startswith('--'):
+            continue
+        if isdir(path):
+            import fnmatch
+            import os
+
+            for root, dirnames, filenames in os.walk(path):
+                dirnames.sort()
+                for filename in sorted(fnmatch.filter(filenames, '*.py')):
+                    yield os.path.join(root, filename)
+        else:
+            yield path
+
+
+def _name_to_dict(name):
+    return {
+        'name': name.name,
+        'type': name.type,
+        'full_name': name.full_name,
+        'module_path': name.module_path,
+        'line': name.line,
+        'column': name.column,
+    }
+
+
+def _print_names():
+    """
+    Prints one JSON object per line for every name in the given files and
+    directories, with its definitions, inferred types and signatures.
+    """
+    import json
+    import jedi
+
+    if '--debug' in sys.argv:
+        jedi.set_debug_function()
+
+    session = jedi.Session()
+    for path in _get_python_files(sys.argv[2:]):
+        script = session.Script(path=path)
+        for name, definitions, inferred in script.iter_inferred_names():
+            signatures = []
+            for n in inferred:
+                for signature in n.get_signatures():
+                    string = signature.to_string()
+                    if string not in signatures:
+                        signatures.append(string)
+            dct = _name_to_dict(name)
+            dct.update(
+                path=path,
+                is_definition=name.is_definition(),
+                definitions=[_name_to_dict(d) for d in definitions],
+                inferred=[_name_to_dict(n) for n in inferred],
+                signatures=signatures,
+            )
+            print(json.dumps(dct, sort_keys=True))
+
+
 def _complete():
     import jedi
     import pdb
@@ -59,5 +118,7 @@ if len(sys.argv) == 2 and sys.argv[1] == 'repl':
     print(join(dirname(abspath(__file__)), 'api', 'replstartup.py'))
 elif len(sys.argv) > 1 and sys.argv[1] == 'linter':
     _start_linter()
+elif len(sys.argv) > 1 and sys.argv[1] == 'names':
+    _print_names()
 elif len(sys.argv) > 1 and sys.argv[1] == '_complete':
     _complete()
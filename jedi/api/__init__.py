@@ -10,6 +10,7 @@ arguments.
 import os
 import sys
 import warnings
+from contextlib import contextmanager
 from functools import wraps
 
 import parso
@@ -120,10 +121,16 @@ class Script(object):
     :param Project project: Provide a :class:`.Project` to make sure finding
         references works well, because the right folder is searched. There are
         also ways to modify the sys path and other things.
+    :param Session session: Reuse the caches of a :class:`.Session`. The
+        project and the environment of the session are used in that case.
+        Typically you want to use :meth:`.Session.Script` instead.
+
+    After a call with a ``timeout``, the attribute ``incomplete`` tells if
+    inference was stopped before everything was found.
     """
     def __init__(self, code=None, line=None, column=None, path=None,
                  encoding=None, sys_path=None, environment=None,
-                 project=None, source=None):
+                 project=None, source=None, session=None):
         self._orig_path = path
         # An empty path (also empty string) should always result in no path.
         self.path = os.path.abspath(path) if path else None
@@ -175,15 +182,20 @@ class Script(object):
         if sys_path is not None and not is_py3:
             sys_path = list(map(force_unicode, sys_path))
 
-        if project is None:
-            # Load the Python grammar of the current interpreter.
-            project = get_default_project(
-                os.path.dirname(self.path) if path else None
+        self._session = session
+        self.incomplete = False
+        if session is not None:
+            self._inference_state = session._get_inference_state(self.path)
+        else:
+            if project is None:
+                # Load the Python grammar of the current interpreter.
+                project = get_default_project(
+                    os.path.dirname(self.path) if path else None
+                )
+
+            self._inference_state = InferenceState(
+                project, environment=environment, script_path=self.path
             )
-
-        self._inference_state = InferenceState(
-            project, environment=environment, script_path=self.path
-        )
         debug.speed('init')
         self._module_node, code = self._inference_state.parse_and_get_code(
             code=code,
@@ -244,12 +256,32 @@ class Script(object):
         )
         if names[0] not in ('builtins', '__builtin__', 'typing'):
             # These modules are essential for Jedi, so don't overwrite them.
-            self._inference_state.module_cache.add(names, ValueSet([module]))
+            module_cache = self._inference_state.module_cache
+            old_modules = module_cache.get(names)
+            module_cache.add(names, ValueSet([module]))
+            if old_modules is not None:
+                # The module of a previous script in the same session.
+                self._inference_state.invalidate_modules(old_modules)
         return module
 
     def _get_module_context(self):
         return self._get_module().as_context()
 
+    @contextmanager
+    def _limit_inference(self, timeout=None, cancellation_token=None):
+        inference_state = self._inference_state
+        self.incomplete = False
+        with inference_state.cancellable(cancellation_token):
+            if timeout is None:
+                yield
+                return
+            with inference_state.time_budget(timeout):
+                yield
+        self.incomplete = inference_state.reached_deadline
+        if self.incomplete:
+            for time_cache in cache._time_caches.values():
+                time_cache.clear()
+
     def __repr__(self):
         return '<%s: %s %r>' % (
             self.__class__.__name__,
@@ -267,18 +299,32 @@ class Script(object):
 
         :param fuzzy: Default False. Will return fuzzy completions, which means
             that e.g. ``ooa`` will match ``foobar``.
+        :param limit: Default None. The maximum number of completions. Only
+            the first completions are created, which is faster for objects
+            with a lot of attributes.
+        :param timeout: Default None. Seconds after which type inference
+            stops and the completions that were found until then are
+            returned. ``Script.incomplete`` is True in that case.
+        :param cancellation_token: A :class:`.CancellationToken`. If it is
+            cancelled, a :class:`.CancelledError` is raised.
         :return: Completion objects, sorted by name. Normal names appear
             before "private" names that start with ``_`` and those appear
             before magic methods and name mangled names that start with ``__``.
+            Fuzzy completions are sorted by how well they match first.
         :rtype: list of :class:`.Completion`
         """
         return self._complete(line, column, **kwargs)
 
-    def _complete(self, line, column, fuzzy=False):  # Python 2...
-        with debug.increase_indent_cm('complete'):
+    def _complete(self, line, column, fuzzy=False, limit=None, timeout=None,
+                  cancellation_token=None):  # Python 2...
+        with debug.increase_indent_cm('complete'), \
+                self._limit_inference(timeout, cancellation_token):
             completion = Completion(
                 self._inference_state, self._get_module_context(), self._code_lines,
                 (line, column), self.get_signatures, fuzzy=fuzzy,
+                trailer_cache=None if self._session is None
+                else self._session._trailer_completion_cache,
+                limit=limit,
             )
             return completion.complete()
 
@@ -305,11 +351,36 @@ class Script(object):
 
         :param only_stubs: Only return stubs for this method.
         :param prefer_stubs: Prefer stubs to Python objects for this method.
+        :param timeout: Default None. Seconds after which type inference
+            stops, see :meth:`complete`.
+        :param cancellation_token: A :class:`.CancellationToken`. If it is
+            cancelled, a :class:`.CancelledError` is raised.
         :rtype: list of :class:`.Name`
         """
         with debug.increase_indent_cm('infer'):
             return self._infer(line, column, **kwargs)
 
+    def infer_many(self, positions, only_stubs=False, prefer_stubs=False,
+                   timeout=None, cancellation_token=None):
+        """
+        Like :meth:`infer`, but for a lot of positions at once. This is a lot
+        faster than creating a :class:`.Script` for every position, because
+        the file is only parsed once and inferred results are shared. Positions
+        on the same name are only inferred once.
+
+        :param positions: An iterable of ``(line, column)`` tuples.
+        :param timeout: Default None. Seconds after which type inference
+            stops for all remaining positions, see :meth:`complete`.
+        :param cancellation_token: A :class:`.CancellationToken`, see
+            :meth:`infer`.
+        :rtype: list of lists of :class:`.Name`, in the order of the positions
+        """
+        return self._call_many(
+            lambda line, column: self._infer_without_timeout(
+                line, column, only_stubs, prefer_stubs),
+            positions, timeout, cancellation_token,
+        )
+
     def goto_definitions(self, **kwargs):
         warnings.warn(
             "Deprecated since version 0.16.0. Use Script(...).infer instead.",
@@ -318,7 +389,12 @@ class Script(object):
         )
         return self.infer(*self._pos, **kwargs)
 
-    def _infer(self, line, column, only_stubs=False, prefer_stubs=False):
+    def _infer(self, line, column, only_stubs=False, prefer_stubs=False, timeout=None,
+               cancellation_token=None):
+        with self._limit_inference(timeout, cancellation_token):
+            return self._infer_without_timeout(line, column, only_stubs, prefer_stubs)
+
+    def _infer_without_timeout(self, line, column, only_stubs, prefer_stubs):
         pos = line, column
         leaf = self._module_node.get_name_of_position(pos)
         if leaf is None:
@@ -365,13 +441,62 @@ class Script(object):
             to look up names in builtins (i.e. compiled or extension modules).
         :param only_stubs: Only return stubs for this method.
         :param prefer_stubs: Prefer stubs to Python objects for this method.
+        :param cancellation_token: A :class:`.CancellationToken`. If it is
+            cancelled, a :class:`.CancelledError` is raised.
         :rtype: list of :class:`.Name`
         """
         with debug.increase_indent_cm('goto'):
             return self._goto(line, column, **kwargs)
 
+    def goto_many(self, positions, follow_imports=False, follow_builtin_imports=False,
+                  only_stubs=False, prefer_stubs=False, cancellation_token=None):
+        """
+        Like :meth:`goto`, but for a lot of positions at once. See
+        :meth:`infer_many`.
+
+        :param positions: An iterable of ``(line, column)`` tuples.
+        :rtype: list of lists of :class:`.Name`, in the order of the positions
+        """
+        return self._call_many(
+            lambda line, column: self._goto_without_cancellation(
+                line, column, follow_imports, follow_builtin_imports,
+                only_stubs, prefer_stubs),
+            positions, None, cancellation_token,
+        )
+
+    @validate_line_column
+    def _validate_position(self, line, column):
+        return line, column
+
+    def _call_many(self, func, positions, timeout, cancellation_token,
+                   get_key=None):
+        positions = [self._validate_position(line, column) for line, column in positions]
+        if get_key is None:
+            get_key = self._module_node.get_name_of_position
+        results = {}
+        result_lists = []
+        # The module context, the limits and the inference caches are shared
+        # by all positions.
+        with self._limit_inference(timeout, cancellation_token):
+            for position in positions:
+                key = get_key(position)
+                if key is None:
+                    key = position
+                try:
+                    result = results[key]
+                except KeyError:
+                    result = results[key] = func(*position)
+                result_lists.append(list(result))
+        return result_lists
+
     def _goto(self, line, column, follow_imports=False, follow_builtin_imports=False,
-              only_stubs=False, prefer_stubs=False):
+              only_stubs=False, prefer_stubs=False, cancellation_token=None):
+        with self._limit_inference(cancellation_token=cancellation_token):
+            return self._goto_without_cancellation(
+                line, column, follow_imports, follow_builtin_imports, only_stubs, prefer_stubs)
+
+    def _goto_without_cancellation(self, line, column, follow_imports,
+                                   follow_builtin_imports, only_stubs, prefer_stubs):
         tree_name = self._module_node.get_name_of_position((line, column))
         if tree_name is None:
             # Without a name we really just want to jump to the result e.g.
@@ -496,16 +621,19 @@ class Script(object):
 
         :param include_builtins: Default True, checks if a reference is a
             builtin (e.g. ``sys``) and in that case does not return it.
+        :param cancellation_token: A :class:`.CancellationToken`. If it is
+            cancelled, a :class:`.CancelledError` is raised.
         :rtype: list of :class:`.Name`
         """
 
-        def _references(include_builtins=True):
+        def _references(include_builtins=True, cancellation_token=None):
             tree_name = self._module_node.get_name_of_position((line, column))
             if tree_name is None:
                 # Must be syntax
                 return []
 
-            names = find_references(self._get_module_context(), tree_name)
+            with self._limit_inference(cancellation_token=cancellation_token):
+                names = find_references(self._get_module_context(), tree_name)
 
             definitions = [classes.Name(self._inference_state, n) for n in names]
             if not include_builtins:
@@ -522,7 +650,7 @@ class Script(object):
         return self.get_signatures(*self._pos)
 
     @validate_line_column
-    def get_signatures(self, line=None, column=None):
+    def get_signatures(self, line=None, column=None, timeout=None, cancellation_token=None):
         """
         Return the function object of the call under the cursor.
 
@@ -536,13 +664,56 @@ class Script(object):
 
         This would return an empty list..
 
+        :param timeout: Default None. Seconds after which type inference
+            stops, see :meth:`complete`.
+        :param cancellation_token: A :class:`.CancellationToken`. If it is
+            cancelled, a :class:`.CancelledError` is raised.
         :rtype: list of :class:`.Signature`
         """
+        with self._limit_inference(timeout, cancellation_token):
+            return self._get_signatures(line, column)
+
+    def get_signatures_many(self, positions, timeout=None, cancellation_token=None):
+        """
+        Like :meth:`get_signatures`, but for a lot of positions at once. Calls
+        are only inferred once, even if there are multiple positions in their
+        brackets. See :meth:`infer_many`.
+
+        :param positions: An iterable of ``(line, column)`` tuples.
+        :rtype: list of lists of :class:`.Signature`, in the order of the
+            positions
+        """
+        signatures = {}
+
+        def get_signatures(line, column):
+            call_details = helpers.get_signature_details(self._module_node, (line, column))
+            if call_details is None:
+                return []
+            bracket_leaf = call_details.bracket_leaf
+            try:
+                found = signatures[bracket_leaf]
+            except KeyError:
+                found = signatures[bracket_leaf] = \
+                    self._infer_signatures(call_details, (line, column))
+            # The signatures are the same, but the current parameter is not.
+            return [classes.Signature(self._inference_state, signature, call_details)
+                    for signature in found]
+
+        return self._call_many(get_signatures, positions, timeout, cancellation_token,
+                               get_key=lambda position: None)
+
+    def _get_signatures(self, line, column):
         pos = line, column
         call_details = helpers.get_signature_details(self._module_node, pos)
         if call_details is None:
             return []
 
+        # TODO here we use stubs instead of the actual values. We should use
+        # the signatures from stubs, but the actual values, probably?!
+        return [classes.Signature(self._inference_state, signature, call_details)
+                for signature in self._infer_signatures(call_details, pos)]
+
+    def _infer_signatures(self, call_details, pos):
         context = self._get_module_context().create_context(call_details.bracket_leaf)
         definitions = helpers.cache_signatures(
             self._inference_state,
@@ -552,11 +723,7 @@ class Script(object):
             pos
         )
         debug.speed('func_call followed')
-
-        # TODO here we use stubs instead of the actual values. We should use
-        # the signatures from stubs, but the actual values, probably?!
-        return [classes.Signature(self._inference_state, signature, call_details)
-                for signature in definitions.get_signatures()]
+        return definitions.get_signatures()
 
     @validate_line_column
     def get_context(self, line=None, column=None):
@@ -648,6 +815,62 @@ class Script(object):
         names = self._names(**kwargs)
         return [classes.Name(self._inference_state, n) for n in names]
 
+    def iter_inferred_names(self, all_scopes=True, definitions=True, references=True):
+        """
+        Walks through the names of the current file and yields their
+        definitions and inferred types. The results are yielded while walking,
+        so they can be written out before the whole file is inferred. All names
+        share the caches of this script and attributes like ``bar`` in
+        ``foo.bar`` reuse the types of the names before them, which makes this
+        a lot faster than calling :meth:`goto` and :meth:`infer` for all names.
+        This is typically used to build databases for hovers or cross
+        references, see also ``python -m jedi names``.
+
+        The parameters are the same as the ones of :meth:`get_names`, but all
+        of them are enabled by default.
+
+        :rtype: iterator of ``(name, definitions, inferred)`` tuples of a
+            :class:`.Name` and two lists of :class:`.Name`
+        """
+        inference_state = self._inference_state
+        module_context = self._get_module_context()
+        # The names are sorted by their position, so the name before an
+        # attribute is always inferred first.
+        inferred_leaves = {}
+        for name in self._names(all_scopes=all_scopes,
+                                definitions=definitions,
+                                references=references):
+            goto_names = values = []
+            if name.is_value_name:
+                tree_name = name.tree_name
+                context = module_context.create_context(tree_name)
+                base = helpers.get_attribute_base(tree_name)
+                if base in inferred_leaves:
+                    # The same as inferring the whole ``foo.bar`` expression,
+                    # but without inferring ``foo`` again.
+                    base_values = inferred_leaves.pop(base)
+                    raw_values = base_values.py__getattribute__(
+                        name_context=context,
+                        name_or_str=tree_name,
+                    )
+                    goto_names = base_values.goto(tree_name, name_context=context)
+                else:
+                    raw_values = helpers.infer(inference_state, context, tree_name)
+                    goto_names = name.goto()
+                if helpers.has_attribute(tree_name):
+                    inferred_leaves[tree_name] = raw_values
+                goto_names = convert_names(goto_names)
+                values = convert_values(raw_values)
+            yield (
+                classes.Name(inference_state, name),
+                helpers.sorted_definitions(
+                    set(classes.Name(inference_state, n) for n in goto_names)
+                ),
+                helpers.sorted_definitions(
+                    set(classes.Name(inference_state, v.name) for v in values)
+                ),
+            )
+
     def get_syntax_errors(self):
         """
         Lists all syntax errors in the current file.
@@ -0,0 +1,25 @@
+"""
+Language servers often get a new request before the previous one is finished.
+The old request can be stopped with a :class:`.CancellationToken`::
+
+    token = jedi.CancellationToken()
+    # In the worker thread:
+    script.complete(line, column, cancellation_token=token)
+    # In the thread that gets a newer request:
+    token.cancel()
+
+The call then raises a :class:`.CancelledError` the next time inference checks
+the token.
+"""
+
+
+class CancellationToken(object):
+    """
+    Cancels the calls it was given to, e.g. from another thread. A token
+    cannot be reset, use a new one for every request.
+    """
+    def __init__(self):
+        self.cancelled = False
+
+    def cancel(self):
+        self.cancelled = True
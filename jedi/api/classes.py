@@ -28,6 +28,7 @@ from jedi.inference.imports import ImportName
 from jedi.inference.gradual.typeshed import StubModuleValue
 from jedi.inference.gradual.conversion import convert_names, convert_values
 from jedi.inference.base_value import ValueSet
+from jedi.inference.compiled import prefetch_compiled_names, prefetch_compiled_docstrings
 from jedi.api.keywords import KeywordName
 from jedi.api import completion_cache
 from jedi.api.helpers import filter_follow_imports
@@ -674,43 +675,41 @@ class Completion(BaseName):
 
         return super(Completion, self).docstring(raw=raw, fast=fast)
 
+    @memoize_method
     def _get_docstring(self):
         if self._cached_name is not None:
             return completion_cache.get_docstring(
                 self._cached_name,
                 self._name.get_public_name(),
-                lambda: self._get_cache()
+                lambda: super(Completion, self)._get_docstring()
             )
         return super(Completion, self)._get_docstring()
 
+    @memoize_method
     def _get_docstring_signature(self):
         if self._cached_name is not None:
             return completion_cache.get_docstring_signature(
                 self._cached_name,
                 self._name.get_public_name(),
-                lambda: self._get_cache()
+                lambda: super(Completion, self)._get_docstring_signature()
             )
         return super(Completion, self)._get_docstring_signature()
 
-    def _get_cache(self):
-        typ = super(Completion, self).type
-        return (
-            typ,
-            super(Completion, self)._get_docstring_signature(),
-            super(Completion, self)._get_docstring(),
-        )
-
     @property
     def type(self):
         """
         Documentated under :meth:`BaseName.type`.
         """
+        return self._get_type()
+
+    @memoize_method
+    def _get_type(self):
         # Purely a speed optimization.
         if self._cached_name is not None:
             return completion_cache.get_type(
                 self._cached_name,
                 self._name.get_public_name(),
-                lambda: self._get_cache()
+                lambda: super(Completion, self).type
             )
 
         return super(Completion, self).type
@@ -719,6 +718,44 @@ class Completion(BaseName):
         return '<%s: %s>' % (type(self).__name__, self._name.get_public_name())
 
 
+def _prefetch_completions(completions, prefetch, number):
+    by_inference_state = {}
+    for completion in completions:
+        cached_name = completion._cached_name
+        if cached_name is not None and completion_cache.has_entry(
+                cached_name, completion._name.get_public_name(), number):
+            continue
+        by_inference_state.setdefault(completion._inference_state, []).append(completion._name)
+    for inference_state, names in by_inference_state.items():
+        prefetch(inference_state, names)
+
+
+def resolve_types(completions):
+    """
+    Returns the :attr:`Completion.type` of all completions. This is faster
+    than using the completions one by one, because compiled objects are
+    inspected with one round trip to the subprocess. The results are also
+    kept by the completions.
+
+    :param completions: A list of :class:`.Completion`.
+    :rtype: list of str
+    """
+    _prefetch_completions(completions, prefetch_compiled_names, 0)
+    return [c.type for c in completions]
+
+
+def resolve_docstrings(completions, raw=False, fast=True):
+    """
+    Returns the :meth:`Completion.docstring` of all completions, like
+    :func:`resolve_types`.
+
+    :param completions: A list of :class:`.Completion`.
+    :rtype: list of str
+    """
+    _prefetch_completions(completions, prefetch_compiled_docstrings, 2)
+    return [c.docstring(raw=raw, fast=fast) for c in completions]
+
+
 class Name(BaseName):
     """
     *Name* objects are returned from many different APIs including
@@ -1,4 +1,6 @@
+import os
 import re
+from bisect import bisect_left
 from textwrap import dedent
 
 from parso.python.token import PythonTokenTypes
@@ -10,17 +12,20 @@ from jedi._compatibility import Parameter
 from jedi import debug
 from jedi import settings
 from jedi.api import classes
+from jedi.api import completion_cache
 from jedi.api import helpers
 from jedi.api import keywords
 from jedi.api.strings import complete_dict
 from jedi.api.file_name import complete_file_name
 from jedi.inference import imports
+from jedi.inference.compiled import prefetch_compiled_names
 from jedi.inference.base_value import ValueSet
 from jedi.inference.helpers import infer_call_of_leaf, parse_dotted_names
 from jedi.inference.context import get_global_filters
 from jedi.inference.value import TreeInstance, ModuleValue
 from jedi.inference.names import ParamNameWrapper, SubModuleName
 from jedi.inference.gradual.conversion import convert_values, convert_names
+from jedi.inference.gradual.typeshed import TYPESHED_PATH
 from jedi.parser_utils import cut_value_at_position
 from jedi.plugins import plugin_manager
 
@@ -40,32 +45,113 @@ def get_signature_param_names(signatures):
                 yield ParamNameWithEquals(p._name)
 
 
-def filter_names(inference_state, completion_names, stack, like_name, fuzzy, cached_name):
+class CompletionNameIndex(object):
+    """
+    The names of a completion, sorted by their strings. Names that start with
+    a prefix are found with a binary search, which matters for modules and
+    classes with thousands of names. The index can be reused for different
+    prefixes of the same completion.
+    """
+    def __init__(self, names):
+        self._names = list(names)
+        self._sorted = {}
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def _get_string(self, name, case_insensitive):
+        string = name.string_name
+        if case_insensitive:
+            return string.lower()
+        return string
+
+    def _get_sorted(self, case_insensitive):
+        try:
+            return self._sorted[case_insensitive]
+        except KeyError:
+            entries = sorted(
+                (self._get_string(name, case_insensitive), i)
+                for i, name in enumerate(self._names)
+            )
+            result = self._sorted[case_insensitive] = (
+                [string for string, _ in entries],
+                [i for _, i in entries],
+            )
+            return result
+
+    def get_matches(self, like_name, fuzzy, case_insensitive):
+        """
+        Returns a list of ``(score, index, name)``. The index is the position
+        of the name in the completion.
+        """
+        if fuzzy:
+            matches = []
+            for i, name in enumerate(self._names):
+                string = self._get_string(name, case_insensitive)
+                score = helpers.fuzzy_score(string, like_name)
+                if score is not None:
+                    matches.append((score, i, name))
+            return matches
+
+        strings, indexes = self._get_sorted(case_insensitive)
+        matches = []
+        for position in range(bisect_left(strings, like_name), len(strings)):
+            if not strings[position].startswith(like_name):
+                break
+            i = indexes[position]
+            matches.append((None, i, self._names[i]))
+        return matches
+
+
+def _get_rank(match):
+    score, index, name = match
+    string = name.get_public_name()
+    # Normal names appear before "private" names and those before magic
+    # methods. The index keeps the order of names with the same string.
+    if score is None:
+        return string.startswith('__'), string.startswith('_'), string.lower(), index
+    return string.startswith('__'), string.startswith('_'), score, string.lower(), index
+
+
+def filter_names(inference_state, completion_names, stack, like_name, fuzzy, cached_name,
+                 limit=None):
+    """
+    Returns the completions of the names that match ``like_name``, sorted.
+    If ``limit`` is given, only the first completions are created.
+    """
+    if not isinstance(completion_names, CompletionNameIndex):
+        completion_names = CompletionNameIndex(completion_names)
     comp_dct = set()
     if settings.case_insensitive_completion:
         like_name = like_name.lower()
-    for name in completion_names:
-        string = name.string_name
-        if settings.case_insensitive_completion:
-            string = string.lower()
-        if helpers.match(string, like_name, fuzzy=fuzzy):
-            new = classes.Completion(
-                inference_state,
-                name,
-                stack,
-                len(like_name),
-                is_fuzzy=fuzzy,
-                cached_name=cached_name,
-            )
-            k = (new.name, new.complete)  # key
-            if k not in comp_dct:
-                comp_dct.add(k)
-                tree_name = name.tree_name
-                if tree_name is not None:
-                    definition = tree_name.get_definition()
-                    if definition is not None and definition.type == 'del_stmt':
-                        continue
-                yield new
+    matches = completion_names.get_matches(
+        like_name, fuzzy, settings.case_insensitive_completion)
+    # Ranking strings is a lot cheaper than creating completions for all of
+    # them.
+    matches.sort(key=_get_rank)
+
+    count = 0
+    for _, _, name in matches:
+        if limit is not None and count >= limit:
+            break
+        new = classes.Completion(
+            inference_state,
+            name,
+            stack,
+            len(like_name),
+            is_fuzzy=fuzzy,
+            cached_name=cached_name,
+        )
+        k = (new.name, new.complete)  # key
+        if k not in comp_dct:
+            comp_dct.add(k)
+            tree_name = name.tree_name
+            if tree_name is not None:
+                definition = tree_name.get_definition()
+                if definition is not None and definition.type == 'del_stmt':
+                    continue
+            count += 1
+            yield new
 
 
 def _remove_duplicates(completions, other_completions):
@@ -96,9 +182,32 @@ def complete_param_names(context, function_name, decorator_nodes):
     return []
 
 
+class TrailerCompletionCache(object):
+    """
+    Remembers the unfiltered names of the last trailer completion like
+    ``foo.ba``. While the user keeps typing ``foo.bar``, the code around the
+    name does not change and the names only need to be filtered again.
+    """
+    def __init__(self):
+        self._key = None
+        self._result = None
+
+    def get(self, key):
+        if key == self._key:
+            return self._result
+        return None
+
+    def set(self, key, result):
+        self._key = key
+        self._result = result
+
+    def clear(self):
+        self._key = self._result = None
+
+
 class Completion:
     def __init__(self, inference_state, module_context, code_lines, position,
-                 signatures_callback, fuzzy=False):
+                 signatures_callback, fuzzy=False, trailer_cache=None, limit=None):
         self._inference_state = inference_state
         self._module_context = module_context
         self._module_node = module_context.tree_node
@@ -112,6 +221,9 @@ class Completion:
         self._signatures_callback = signatures_callback
 
         self._fuzzy = fuzzy
+        self._trailer_cache = trailer_cache
+        self._limit = limit
+        self._is_trailer_completion = False
 
     def complete(self):
         leaf = self._module_node.get_leaf_for_position(
@@ -142,18 +254,51 @@ class Completion:
                 prefixed_completions = self._complete_in_string(start_leaf, string)
             return prefixed_completions
 
-        cached_name, completion_names = self._complete_python(leaf)
+        cache_key = None
+        cached = None
+        if self._trailer_cache is not None:
+            cache_key = self._get_trailer_cache_key()
+            cached = self._trailer_cache.get(cache_key)
+        if cached is None:
+            cached_name, completion_names = self._complete_python(leaf)
+            completion_names = CompletionNameIndex(completion_names)
+            if self._is_trailer_completion and cache_key is not None \
+                    and not self._inference_state.is_past_deadline():
+                self._trailer_cache.set(cache_key, (cached_name, completion_names, self.stack))
+        else:
+            debug.dbg('Reusing the names of the previous trailer completion')
+            cached_name, completion_names, self.stack = cached
 
         completions = list(filter_names(self._inference_state, completion_names,
                                         self.stack, self._like_name,
-                                        self._fuzzy, cached_name=cached_name))
-
+                                        self._fuzzy, cached_name=cached_name,
+                                        limit=self._limit))
+        # Types of cached names come from the completion cache.
+        prefetch_compiled_names(self._inference_state, [
+            c._name for c in completions
+            if cached_name is None
+            or not completion_cache.has_entry(cached_name, c._name.get_public_name())
+        ])
+
+        # Removing duplicates mostly to remove False/True/None duplicates.
+        result = _remove_duplicates(prefixed_completions, completions) + completions
+        if self._limit is not None:
+            del result[self._limit:]
+        return result
+
+    def _get_trailer_cache_key(self):
+        """
+        Everything except the name that is being completed.
+        """
+        line, column = self._original_position
+        start_column = column - len(self._like_name)
+        lines = self._code_lines
         return (
-            # Removing duplicates mostly to remove False/True/None duplicates.
-            _remove_duplicates(prefixed_completions, completions)
-            + sorted(completions, key=lambda x: (x.name.startswith('__'),
-                                                 x.name.startswith('_'),
-                                                 x.name.lower()))
+            self._inference_state,
+            self._module_context.py__file__(),
+            (line, start_column),
+            ''.join(lines[:line - 1]) + lines[line - 1][:start_column],
+            lines[line - 1][column:] + ''.join(lines[line:]),
         )
 
     def _complete_python(self, leaf):
@@ -261,6 +406,7 @@ class Completion:
                 dot = self._module_node.get_leaf_for_position(self._position)
                 cached_name, n = self._complete_trailer(dot.get_previous_leaf())
                 completion_names += n
+                self._is_trailer_completion = True
             elif self._is_parameter_completion():
                 completion_names += self._complete_params(leaf)
             else:
@@ -341,19 +487,42 @@ class Completion:
         values = infer_call_of_leaf(inferred_context, previous_leaf)
         debug.dbg('trailer completion values: %s', values, color='MAGENTA')
 
-        # The cached name simply exists to make speed optimizations for certain
-        # modules.
+        # The cached name simply exists to make speed optimizations for
+        # modules that don't change often.
         cached_name = None
         if len(values) == 1:
             v, = values
-            if v.is_module():
-                if len(v.string_names) == 1:
-                    module_name = v.string_names[0]
-                    if module_name in ('numpy', 'tensorflow', 'matplotlib', 'pandas'):
-                        cached_name = module_name
+            if v.is_module() and v.string_names:
+                module_name = '.'.join(v.string_names)
+                if v.string_names[0] in ('numpy', 'tensorflow', 'matplotlib', 'pandas'):
+                    cached_name = completion_cache.load_module(module_name, v)
+                elif self._is_library_module(v):
+                    # Only modules with a file can be invalidated once they
+                    # change.
+                    cached_name = completion_cache.load_module(
+                        module_name, v, only_with_file=True)
 
         return cached_name, self._complete_trailer_for_values(values)
 
+    def _is_library_module(self, module):
+        path = module.py__file__()
+        if path is None:
+            return False
+        path = _normalize_path(path)
+        if _is_in_directory(path, TYPESHED_PATH):
+            # Jedi's own stubs are inside of the project if Jedi is the
+            # project.
+            return True
+        if any(part in ('site-packages', 'dist-packages') for part in path.split(os.path.sep)):
+            # Installed packages don't change, even if they are in a virtualenv
+            # in the project.
+            return True
+        # Modules of the project change while the user works on them.
+        if _is_in_directory(path, self._inference_state.project._path):
+            return False
+        sys_path = self._inference_state.get_sys_path()
+        return any(_is_in_directory(path, p) for p in sys_path if p)
+
     def _complete_trailer_for_values(self, values):
         user_context = get_user_context(self._module_context, self._position)
 
@@ -451,6 +620,15 @@ def _gather_nodes(stack):
 _string_start = re.compile(r'^\w*(\'{3}|"{3}|\'|")')
 
 
+def _normalize_path(path):
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _is_in_directory(path, directory):
+    directory = os.path.join(_normalize_path(directory), '')
+    return path.startswith(directory)
+
+
 def _extract_string_while_in_string(leaf, position):
     def return_part_of_leaf(leaf):
         kwargs = {}
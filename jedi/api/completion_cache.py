@@ -1,22 +1,200 @@
-_cache = {}
+"""
+Caches the type and the docstrings of completions for library modules like
+``numpy``, because inferring them for hundreds of names is slow. The results
+are also saved to disk, so other processes don't have to infer them again.
 
+The entries of a module are stored under a key of the module name and the
+executable of the environment, because modules of different environments are
+not the same. An entry of a name is a tuple of the type, the docstring
+signature and the docstring. Parts that were not needed yet are None.
 
-def save_entry(module_name, name, cache):
+The entries of a module are only valid as long as the module and the modules
+it imports from don't change, since names like ``numpy.array`` are usually
+imported from other modules.
+"""
+import os
+import atexit
+from collections import OrderedDict
+
+from jedi.cache import load_from_disk_cache, save_to_disk_cache
+from jedi.inference.imports import Importer
+from jedi.inference.gradual.typeshed import TYPESHED_PATH
+
+_MODULE_LIMIT = 100
+"""
+The entries of this many modules are kept in memory. The least recently used
+modules are saved to disk and removed from memory.
+"""
+
+_DEPENDENCY_LIMIT = 200
+"""
+The maximum amount of imported modules that are checked for changes.
+"""
+
+_cache = OrderedDict()
+_disk_keys = {}
+_unsaved = set()
+
+
+def _iter_imported_modules(module):
+    """
+    Yields the modules that are imported on the module level and if they are
+    star imported.
+    """
+    module_context = module.as_context()
+    for import_node in module.tree_node.iter_imports():
+        for path in import_node.get_paths():
+            values = Importer(module.inference_state, path, module_context,
+                              import_node.level).follow()
+            if not values and import_node.type == 'import_from':
+                # The last name is not a module, but a name in a module.
+                values = Importer(module.inference_state, path[:-1],
+                                  module_context, import_node.level).follow()
+            for value in values:
+                yield value, import_node.is_star_import()
+
+
+def _get_dependencies(module):
+    """
+    Returns the paths of the modules whose names a module might use. Star
+    imports are followed, because they make all names of a module available.
+    """
+    path = module.py__file__()
+    if path.startswith(TYPESHED_PATH):
+        # The stubs of Jedi only change with Jedi's version.
+        return []
+    key = repr((path, module.file_io.get_last_modified(),
+                module.inference_state.environment._sha256))
+    dependencies = load_from_disk_cache('completion_dependencies', key)
+    if dependencies is not None:
+        return dependencies
+
+    dependencies = []
+    modules = [module]
+    while modules and len(dependencies) < _DEPENDENCY_LIMIT:
+        for value, is_star_import in _iter_imported_modules(modules.pop()):
+            if getattr(value, 'file_io', None) is None \
+                    or getattr(value, 'tree_node', None) is None:
+                continue
+            dependency = value.py__file__()
+            if dependency == path or dependency in dependencies:
+                continue
+            dependencies.append(dependency)
+            if is_star_import:
+                modules.append(value)
+    save_to_disk_cache('completion_dependencies', key, dependencies)
+    return dependencies
+
+
+def _get_last_modified(path):
     try:
-        module_cache = _cache[module_name]
+        return os.path.getmtime(path)
+    except OSError:
+        return None
+
+
+def _get_disk_key(module):
+    """
+    Returns a key that contains everything the cached results of a module
+    depend on or None if the module cannot be cached on disk.
+    """
+    file_io = getattr(module, 'file_io', None)
+    if file_io is None or getattr(module, 'tree_node', None) is None:
+        return None
+    last_modified = file_io.get_last_modified()
+    if last_modified is None:
+        return None
+    return repr((
+        module.string_names,
+        module.py__file__(),
+        last_modified,
+        [(path, _get_last_modified(path)) for path in _get_dependencies(module)],
+        module.inference_state.environment._sha256,
+    ))
+
+
+def _save(key):
+    if key in _unsaved:
+        _unsaved.remove(key)
+        save_to_disk_cache('completion', _disk_keys[key], _cache[key])
+
+
+def load_module(module_name, module, only_with_file=False):
+    """
+    Loads the entries of a module from disk, if they are not in memory yet or
+    if the module or one of its imports changed.
+
+    :param only_with_file: Don't cache modules that can't be saved on disk.
+    :returns: The key of the entries of the module or None if the module is
+        not cached.
+    """
+    key = module_name, module.inference_state.environment.executable
+    disk_key = _get_disk_key(module)
+    if disk_key is None and only_with_file:
+        return None
+    if key in _cache and _disk_keys.get(key) == disk_key:
+        # Reinsert the module, it's the most recently used one now.
+        _cache[key] = _cache.pop(key)
+        return key
+    # Entries of the old module are not saved anymore.
+    _unsaved.discard(key)
+    _cache.pop(key, None)
+    entries = None
+    if disk_key is None:
+        _disk_keys.pop(key, None)
+    else:
+        _disk_keys[key] = disk_key
+        entries = load_from_disk_cache('completion', disk_key)
+    _cache[key] = entries or {}
+    while len(_cache) > _MODULE_LIMIT:
+        old_key = next(iter(_cache))
+        _save(old_key)
+        del _cache[old_key]
+        _disk_keys.pop(old_key, None)
+    return key
+
+
+def has_entry(key, name, number=0):
+    try:
+        return _cache[key][name][number] is not None
+    except KeyError:
+        return False
+
+
+def save_entry(key, name, cache):
+    try:
+        module_cache = _cache[key]
     except KeyError:
-        module_cache = _cache[module_name] = {}
+        module_cache = _cache[key] = {}
     module_cache[name] = cache
+    if key in _disk_keys:
+        _unsaved.add(key)
+
+
+def save_to_disk():
+    """
+    Saves the entries that were added since the last call. This happens
+    automatically when Python exits.
+    """
+    for key in list(_unsaved):
+        _save(key)
+
+
+atexit.register(save_to_disk)
 
 
 def _create_get_from_cache(number):
-    def _get_from_cache(module_name, name, get_cache_values):
+    def _get_from_cache(key, name, get_cache_value):
         try:
-            return _cache[module_name][name][number]
+            entry = _cache[key][name]
         except KeyError:
-            v = get_cache_values()
-            save_entry(module_name, name, v)
-            return v[number]
+            entry = (None, None, None)
+        value = entry[number]
+        if value is None:
+            value = get_cache_value()
+            entry = entry[:number] + (value,) + entry[number + 1:]
+            save_entry(key, name, entry)
+        return value
     return _get_from_cache
 
 
@@ -7,11 +7,17 @@ import sys
 import hashlib
 import filecmp
 from collections import namedtuple
+from threading import Thread, RLock
 
 from jedi._compatibility import highest_pickle_protocol, which
-from jedi.cache import memoize_method, time_cache
+from jedi import settings
+from jedi import debug
+from jedi.cache import memoize_method, time_cache, load_from_disk_cache, \
+    save_to_disk_cache
 from jedi.inference.compiled.subprocess import CompiledSubprocess, \
-    InferenceStateSameProcess, InferenceStateSubprocess
+    InferenceStateSameProcess, InferenceStateSubprocess, \
+    InferenceStateSandboxProcess
+from jedi.inference.compiled.subprocess.functions import import_modules
 
 import parso
 
@@ -22,6 +28,9 @@ _SAFE_PATHS = ['/usr/bin', '/usr/local/bin']
 _CONDA_VAR = 'CONDA_PREFIX'
 _CURRENT_VERSION = '%s.%s' % (sys.version_info.major, sys.version_info.minor)
 
+# Subprocesses are started in background threads as well, but only once.
+_subprocess_lock = RLock()
+
 
 class InvalidPythonEnvironment(Exception):
     """
@@ -45,6 +54,20 @@ class _BaseEnvironment(object):
             return self._hash
 
 
+# Dict[Tuple[executable, PYTHONPATH], Tuple[List[float], List[str]]]
+_sys_path_cache = {}
+
+
+def _get_modification_times(paths):
+    def get_modification_time(path):
+        try:
+            return os.path.getmtime(path)
+        except OSError:
+            return None
+
+    return [get_modification_time(path) for path in paths]
+
+
 def _get_info():
     return (
         sys.executable,
@@ -53,6 +76,26 @@ def _get_info():
     )
 
 
+def _get_info_cache_key(executable):
+    """
+    The information about an executable only changes if the executable or the
+    symlink to it changes.
+    """
+    try:
+        stat = os.stat(executable)
+        link_stat = os.lstat(executable)
+    except OSError:
+        return None
+    return repr((
+        executable,
+        os.path.realpath(executable),
+        stat.st_mtime,
+        stat.st_ino,
+        stat.st_size,
+        link_stat.st_mtime,
+    ))
+
+
 class Environment(_BaseEnvironment):
     """
     This class is supposed to be created by internal Jedi architecture. You
@@ -60,25 +103,77 @@ class Environment(_BaseEnvironment):
     functions instead. It is then returned by that function.
     """
     _subprocess = None
+    _subprocess_pool = ()
+    _info_cache_key = None
 
     def __init__(self, executable):
         self._start_executable = executable
-        # Initialize the environment
-        self._get_subprocess()
+        # Starting Python just to get the version is slow, so the information
+        # is cached and the subprocess is only started once it's needed.
+        self._info_cache_key = _get_info_cache_key(executable)
+        cached = None
+        if self._info_cache_key is not None:
+            cached = load_from_disk_cache('environments', self._info_cache_key)
+        if cached is None:
+            # Initialize the environment
+            self._get_subprocess()
+        else:
+            info, self._hash = cached
+            self._set_info(info)
+        self._start_in_background()
 
-    def _get_subprocess(self):
-        if self._subprocess is not None and not self._subprocess.is_crashed:
-            return self._subprocess
+    def _start_in_background(self):
+        """
+        Starts the subprocesses while the caller does other work like parsing,
+        so the first inference doesn't have to wait for them.
+        """
+        def start():
+            try:
+                self._get_pooled_subprocess()
+            except InvalidPythonEnvironment as e:
+                # Raised again once the subprocess is actually needed.
+                debug.warning('Starting the subprocess failed: %s', e)
+
+        self._start_thread = thread = Thread(target=start)
+        thread.daemon = True
+        thread.start()
 
+    def _start_subprocess(self):
         try:
-            self._subprocess = CompiledSubprocess(self._start_executable)
-            info = self._subprocess._send(None, _get_info)
+            subprocess = CompiledSubprocess(self._start_executable)
+            info = subprocess._send(None, _get_info)
         except Exception as exc:
             raise InvalidPythonEnvironment(
                 "Could not get version information for %r: %r" % (
                     self._start_executable,
                     exc))
 
+        version_info = _VersionInfo(*info[2])
+        # Adjust pickle protocol according to host and client version.
+        subprocess._pickle_protocol = highest_pickle_protocol([
+            sys.version_info, version_info])
+
+        modules = settings.compiled_subprocess_preloaded_modules
+        if modules:
+            subprocess._send(None, import_modules, (list(modules),))
+        return subprocess, info
+
+    def _get_subprocess(self):
+        with _subprocess_lock:
+            if self._subprocess is not None and not self._subprocess.is_crashed:
+                return self._subprocess
+
+            self._subprocess, info = self._start_subprocess()
+            # py2 sends bytes via pickle apparently?!
+            if info[2][0] == 2:
+                info = info[0].decode(), info[1].decode(), info[2]
+            self._set_info(info)
+            if self._info_cache_key is not None:
+                save_to_disk_cache('environments', self._info_cache_key,
+                                   (tuple(info), self._sha256))
+            return self._subprocess
+
+    def _set_info(self, info):
         # Since it could change and might not be the same(?) as the one given,
         # set it here.
         self.executable = info[0]
@@ -95,25 +190,29 @@ class Environment(_BaseEnvironment):
         Environment's Python version.
         """
 
-        # py2 sends bytes via pickle apparently?!
-        if self.version_info.major == 2:
-            self.executable = self.executable.decode()
-            self.path = self.path.decode()
-
-        # Adjust pickle protocol according to host and client version.
-        self._subprocess._pickle_protocol = highest_pickle_protocol([
-            sys.version_info, self.version_info])
-
-        return self._subprocess
+    def _get_pooled_subprocess(self):
+        """
+        Returns the subprocess with the fewest inference states of the pool.
+        The pool is filled up to :data:`jedi.settings.compiled_subprocess_pool_size`
+        and crashed subprocesses are replaced.
+        """
+        with _subprocess_lock:
+            pool = [self._get_subprocess()]
+            pool += [s for s in self._subprocess_pool if not s.is_crashed]
+            size = max(settings.compiled_subprocess_pool_size, 1)
+            while len(pool) < size:
+                pool.append(self._start_subprocess()[0])
+            del pool[size:]
+            self._subprocess_pool = pool[1:]
+        return min(pool, key=lambda subprocess: subprocess.get_inference_state_count())
 
     def __repr__(self):
         version = '.'.join(str(i) for i in self.version_info)
         return '<%s: %s in %s>' % (self.__class__.__name__, version, self.path)
 
     def get_inference_state_subprocess(self, inference_state):
-        return InferenceStateSubprocess(inference_state, self._get_subprocess())
+        return InferenceStateSubprocess(inference_state, self._get_pooled_subprocess())
 
-    @memoize_method
     def get_sys_path(self):
         """
         The sys path for this environment. Does not include potential
@@ -121,12 +220,26 @@ class Environment(_BaseEnvironment):
 
         :returns: list of str
         """
+        # The sys path is shared by all environments with the same executable.
+        # It only changes if .pth files are added or removed, which modifies
+        # the directories in the sys path.
+        key = self.executable, os.environ.get('PYTHONPATH')
+        try:
+            modification_times, sys_path = _sys_path_cache[key]
+        except KeyError:
+            pass
+        else:
+            if modification_times == _get_modification_times(sys_path):
+                return list(sys_path)
+
         # It's pretty much impossible to generate the sys path without actually
         # executing Python. The sys path (when starting with -S) itself depends
         # on how the Python version was compiled (ENV variables).
         # If you omit -S when starting Python (normal case), additionally
         # site.py gets executed.
-        return self._get_subprocess().get_sys_path()
+        sys_path = self._get_subprocess().get_sys_path()
+        _sys_path_cache[key] = _get_modification_times(sys_path), sys_path
+        return list(sys_path)
 
 
 class _SameEnvironmentMixin(object):
@@ -137,7 +250,15 @@ class _SameEnvironmentMixin(object):
 
 
 class SameEnvironment(_SameEnvironmentMixin, Environment):
-    pass
+    def __init__(self):
+        super(SameEnvironment, self).__init__()
+        if not settings.same_environment_in_process:
+            self._start_in_background()
+
+    def get_inference_state_subprocess(self, inference_state):
+        if settings.same_environment_in_process:
+            return InferenceStateSandboxProcess(inference_state)
+        return super(SameEnvironment, self).get_inference_state_subprocess(inference_state)
 
 
 class InterpreterEnvironment(_SameEnvironmentMixin, _BaseEnvironment):
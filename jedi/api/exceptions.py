@@ -29,3 +29,11 @@ class RefactoringError(_JediError):
     A typical ``RefactoringError`` would tell the user that inlining is not
     possible if no name is under the cursor.
     """
+
+
+class CancelledError(_JediError):
+    """
+    Raised by calls like :meth:`.Script.complete` if the
+    :class:`.CancellationToken` that was given to them is cancelled. It is
+    safe to use Jedi again afterwards.
+    """
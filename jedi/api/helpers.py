@@ -27,12 +27,26 @@ def _start_match(string, like_name):
 
 
 def _fuzzy_match(string, like_name):
-    if len(like_name) <= 1:
-        return like_name in string
-    pos = string.find(like_name[0])
-    if pos >= 0:
-        return _fuzzy_match(string[pos + 1:], like_name[1:])
-    return False
+    return fuzzy_score(string, like_name) is not None
+
+
+def fuzzy_score(string, like_name):
+    """
+    Returns None if the characters of ``like_name`` don't appear in this order
+    in ``string``. Otherwise returns a sortable score, lower is better: Names
+    that start with ``like_name`` come first, then the ones where the
+    characters are close to each other and near the start.
+    """
+    start = pos = string.find(like_name[:1])
+    for character in like_name[1:]:
+        if pos < 0:
+            break
+        pos = string.find(character, pos + 1)
+    if pos < 0:
+        return None
+    if string.startswith(like_name):
+        return 0, 0, 0
+    return 1, pos - start, start
 
 
 def match(string, like_name, fuzzy=False):
@@ -179,6 +193,60 @@ def infer(inference_state, context, leaf):
     return definitions
 
 
+def _get_attribute_trailer(node):
+    """
+    Returns the ``.name`` trailer after a name or after such a trailer.
+    """
+    power = node.parent
+    if power.type != 'atom_expr':
+        return None
+    index = power.children.index(node)
+    if index + 1 >= len(power.children):
+        return None
+    trailer = power.children[index + 1]
+    if trailer.type != 'trailer' or trailer.children[0] != '.':
+        return None
+    return trailer
+
+
+def get_attribute_base(tree_name):
+    """
+    Returns the name before an attribute name like ``bar`` in ``foo.bar`` or
+    ``x.foo.bar``, if the attribute is inferred by looking it up in the values
+    of that name. Returns None otherwise.
+    """
+    if tree.search_ancestor(tree_name, 'error_node') is not None:
+        return None
+    definition = tree_name.get_definition(import_name_always=True)
+    if definition is not None and definition.type != 'expr_stmt':
+        return None
+    trailer = tree_name.parent
+    if trailer.type != 'trailer' or trailer.children[0] != '.':
+        return None
+    power = trailer.parent
+    if power.type != 'atom_expr':
+        return None
+    previous = power.children[power.children.index(trailer) - 1]
+    if previous.type == 'name':
+        # Excludes ``await foo.bar``.
+        return previous if power.children[0] is previous else None
+    if previous.type == 'trailer' and previous.children[0] == '.':
+        return previous.children[1]
+    return None
+
+
+def has_attribute(tree_name):
+    """
+    Returns if a name is the base of an attribute, see
+    :func:`get_attribute_base`.
+    """
+    node = tree_name
+    if node.parent.type == 'trailer':
+        node = node.parent
+    trailer = _get_attribute_trailer(node)
+    return trailer is not None and get_attribute_base(trailer.children[1]) == tree_name
+
+
 def filter_follow_imports(names, follow_builtin_imports=False):
     for name in names:
         if name.is_import():
@@ -15,6 +15,7 @@ import sys
 from jedi._compatibility import FileNotFoundError, PermissionError, \
     IsADirectoryError
 from jedi import debug
+from jedi.cache import load_from_disk_cache, save_to_disk_cache
 from jedi.api.environment import get_cached_default_environment, create_environment
 from jedi.api.exceptions import WrongVersion
 from jedi.api.completion import search_in_module
@@ -25,7 +26,9 @@ from jedi.inference.imports import load_module_from_path, \
 from jedi.inference.sys_path import discover_buildout_paths
 from jedi.inference.cache import inference_state_as_method_param_cache
 from jedi.inference.references import recurse_find_python_folders_and_files, search_in_file_ios
-from jedi.file_io import FolderIO
+from jedi.inference.names import TreeNameDefinition
+from jedi.parser_utils import get_parent_scope
+from jedi.file_io import FolderIO, FileIO
 from jedi.common.utils import traverse_parents
 
 _CONFIG_FOLDER = '.jedi'
@@ -134,15 +137,21 @@ class Project(object):
         :param smart_sys_path: If this is enabled (default), adds paths from
             local directories. Otherwise you will have to rely on your packages
             being properly configured on the ``sys.path``.
+        :param search_index: Default False. Keeps an index of all definitions
+            in the project in the cache directory, which makes searches in big
+            projects complete and fast. Only files that changed are parsed
+            again, but the first search has to parse all files.
         """
         def py2_comp(path, python_path=None, load_unsafe_extensions=False,
-                     sys_path=None, added_sys_path=(), smart_sys_path=True):
+                     sys_path=None, added_sys_path=(), smart_sys_path=True,
+                     search_index=False):
             self._path = os.path.abspath(path)
 
             self._python_path = python_path
             self._sys_path = sys_path
             self._smart_sys_path = smart_sys_path
             self._load_unsafe_extensions = load_unsafe_extensions
+            self._search_index = search_index
             self._django = False
             self.added_sys_path = list(added_sys_path)
             """The sys path that is going to be added at the end of the """
@@ -307,10 +316,14 @@ class Project(object):
                 yield x  # Python 2...
 
         # 2. Search for identifiers in the project.
-        for module_context in search_in_file_ios(inference_state, file_ios, name):
-            names = get_module_names(module_context.tree_node, all_scopes=all_scopes)
-            names = [module_context.create_name(n) for n in names]
-            names = _remove_imports(names)
+        if self._search_index:
+            found = self._search_in_index(
+                inference_state, file_ios, wanted_type, wanted_names, complete,
+                all_scopes)
+        else:
+            found = _iter_module_definitions(
+                search_in_file_ios(inference_state, file_ios, name), all_scopes)
+        for module_context, names in found:
             for x in search_in_module(
                 inference_state,
                 module_context,
@@ -341,10 +354,143 @@ class Project(object):
         ):
             yield x  # Python 2...
 
+    def _search_in_index(self, inference_state, file_ios, wanted_type,
+                         wanted_names, complete, all_scopes):
+        index = _get_symbol_index(self._path)
+        index.update(inference_state, file_ios)
+        found = index.search(
+            wanted_names[0],
+            # The type and completion only apply to the last name.
+            wanted_type=wanted_type if len(wanted_names) == 1 else None,
+            is_prefix=complete and len(wanted_names) == 1,
+            all_scopes=all_scopes,
+        )
+        for path, positions in found:
+            module_context = load_module_from_path(inference_state, FileIO(path)).as_context()
+            tree_node = module_context.tree_node
+            names = [
+                module_context.create_name(tree_node.get_name_of_position(position))
+                for position in positions
+            ]
+            yield module_context, names
+
     def __repr__(self):
         return '<%s: %s>' % (self.__class__.__name__, self._path)
 
 
+def _iter_module_definitions(module_contexts, all_scopes):
+    for module_context in module_contexts:
+        names = get_module_names(module_context.tree_node, all_scopes=all_scopes)
+        names = [module_context.create_name(n) for n in names]
+        yield module_context, _remove_imports(names)
+
+
+def _get_qualified_name(tree_name):
+    names = [tree_name.value]
+    scope = get_parent_scope(tree_name)
+    while scope is not None and scope.type != 'file_input':
+        if scope.type in ('classdef', 'funcdef'):
+            names.insert(0, scope.name.value)
+        scope = get_parent_scope(scope)
+    return '.'.join(names)
+
+
+_symbol_indexes = {}
+
+
+def _get_symbol_index(project_path):
+    try:
+        return _symbol_indexes[project_path]
+    except KeyError:
+        index = _symbol_indexes[project_path] = _SymbolIndex(project_path)
+        return index
+
+
+class _SymbolIndex(object):
+    """
+    Knows the definitions of all Python files of a project. The index is kept
+    in memory and saved in the cache directory. Only files that changed are
+    parsed again.
+    """
+    def __init__(self, project_path):
+        self._project_path = project_path
+        # Dict[str, Tuple[float, List[Tuple[str, str, str, Tuple[int, int], bool]]]],
+        # maps paths to their modification times and definitions. The
+        # definitions consist of the name, its qualified name, its type, its
+        # position and if it's on the module level.
+        self._files = load_from_disk_cache('symbol_index', project_path) or {}
+        self._paths = []
+
+    def update(self, inference_state, file_ios):
+        self._paths = []
+        changed = False
+        for file_io in file_ios:
+            self._paths.append(file_io.path)
+            last_modified = file_io.get_last_modified()
+            entry = self._files.get(file_io.path)
+            if entry is None or entry[0] != last_modified:
+                self._files[file_io.path] = \
+                    last_modified, self._get_definitions(inference_state, file_io)
+                changed = True
+
+        if len(self._paths) != len(self._files):
+            # Files were deleted.
+            paths = set(self._paths)
+            for path in list(self._files):
+                if path not in paths:
+                    del self._files[path]
+            changed = True
+
+        if changed:
+            debug.dbg('Saving the search index of %s', self._project_path)
+            save_to_disk_cache('symbol_index', self._project_path, self._files)
+
+    def _get_definitions(self, inference_state, file_io):
+        try:
+            # Don't use the parser cache, because it keeps all modules in
+            # memory.
+            module = inference_state.parse(file_io=file_io, cache=False)
+        except FileNotFoundError:
+            return []
+        module_level_names = set(get_module_names(module, all_scopes=False))
+        definitions = []
+        for name in get_module_names(module, all_scopes=True):
+            definition = name.get_definition(import_name_always=True)
+            type_ = 'statement' if definition is None else definition.type
+            type_ = TreeNameDefinition._API_TYPES.get(type_, 'statement')
+            if type_ == 'module':
+                # Imports are not part of the search results.
+                continue
+            definitions.append((
+                name.value,
+                _get_qualified_name(name),
+                type_,
+                name.start_pos,
+                name in module_level_names,
+            ))
+        return definitions
+
+    def search(self, string, wanted_type=None, is_prefix=False, all_scopes=False):
+        """
+        Yields the paths of the updated files with the positions of the
+        definitions that have the given name, ignoring the case.
+        """
+        string = string.lower()
+        for path in self._paths:
+            _, definitions = self._files[path]
+            positions = []
+            for name, _, type_, position, is_module_level in definitions:
+                if not all_scopes and not is_module_level:
+                    continue
+                if wanted_type and type_ != wanted_type:
+                    continue
+                name = name.lower()
+                if name == string or is_prefix and name.startswith(string):
+                    positions.append(position)
+            if positions:
+                yield path, positions
+
+
 def _is_potential_project(path):
     for name in _CONTAINS_POTENTIAL_PROJECT:
         if os.path.exists(os.path.join(path, name)):
@@ -0,0 +1,101 @@
+"""
+Sessions are useful for long running processes like language servers or
+editor plugins. Normally every :class:`.Script` starts with empty caches, which
+means that modules like ``builtins`` or ``typing`` are inferred again and again.
+A :class:`.Session` keeps Jedi's internal state alive for all scripts that are
+created with it. Modules whose files change on disk are thrown away when the
+next script is created, everything else is reused.
+
+>>> from jedi import Session
+>>> session = Session()
+>>> script = session.Script('import json; json.lo')
+>>> script.complete()
+[<Completion: load>, <Completion: loads>]
+"""
+from jedi.cache import get_memoize_method_statistics
+from jedi.api.project import get_default_project
+from jedi.api.completion import TrailerCompletionCache
+from jedi.inference import InferenceState
+from jedi.inference.cache import MemoizeStatistics
+
+
+def _get_function_name(function):
+    name = getattr(function, '__qualname__', function.__name__)
+    return '%s.%s' % (function.__module__, name)
+
+
+class Session(object):
+    """
+    A session works for exactly one project and one environment. If you are
+    working with different projects, you should probably use one session per
+    project.
+
+    :param Project project: Defaults to :func:`.get_default_project`.
+    :param Environment environment: Defaults to the environment of the
+        project.
+    """
+    def __init__(self, project=None, environment=None):
+        if project is None:
+            project = get_default_project()
+        if environment is None:
+            # The subprocesses of the environment are started in the
+            # background right away.
+            environment = project.get_environment()
+        self._project = project
+        self._environment = environment
+        self._inference_state = None
+        self._trailer_completion_cache = TrailerCompletionCache()
+
+    def _get_inference_state(self, script_path):
+        inference_state = self._inference_state
+        if inference_state is None or inference_state.compiled_subprocess.is_crashed:
+            inference_state = InferenceState(
+                self._project,
+                environment=self._environment,
+                script_path=script_path,
+                track_dependencies=True,
+            )
+            self._inference_state = inference_state
+            self._trailer_completion_cache.clear()
+        elif inference_state.prepare_for_script(script_path):
+            # Names of other modules might have changed.
+            self._trailer_completion_cache.clear()
+        return inference_state
+
+    def Script(self, code=None, path=None):
+        """
+        Creates a :class:`.Script` that uses the caches of this session. Only
+        the most recently created script of a session should be used, older
+        ones might return wrong results.
+
+        :param code: See :class:`.Script`.
+        :param path: See :class:`.Script`.
+        :rtype: :class:`.Script`
+        """
+        from jedi.api import Script
+        return Script(code, path=path, session=self)
+
+    def get_cache_statistics(self):
+        """
+        Returns the statistics of Jedi's caches, which is useful to choose
+        :data:`jedi.settings.memoize_cache_size`. The result maps the names of
+        the cached functions to named tuples with ``hits``, ``misses``,
+        ``evictions`` and ``size``. Sizes are numbers of entries, not bytes.
+
+        Methods that cache their results on instances only report the hits and
+        misses of the whole process, their size is ``None``.
+
+        :rtype: dict
+        """
+        statistics = dict(
+            (_get_function_name(method), MemoizeStatistics(hits, misses, 0, None))
+            for method, (hits, misses) in get_memoize_method_statistics().items()
+        )
+        if self._inference_state is not None:
+            memoize_cache = self._inference_state.memoize_cache
+            for function, s in memoize_cache.get_statistics().items():
+                statistics[_get_function_name(function)] = s
+        return statistics
+
+    def __repr__(self):
+        return '<%s: %s>' % (self.__class__.__name__, self._project)
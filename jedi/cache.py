@@ -6,18 +6,29 @@ available:
 - ``time_cache`` can be used to cache something for just a limited time span,
   which can be useful if there's user interaction and the user cannot react
   faster than a certain time.
+- ``memoize_method`` caches the results of a method on the instance and counts
+  its hits and misses.
+- ``load_from_disk_cache`` and ``save_to_disk_cache`` persist data between
+  processes in :data:`jedi.settings.cache_directory`.
 
 This module is one of the reasons why |jedi| is not thread-safe. As you can see
 there are global variables, which are holding the cache information. Some of
 these variables are being cleaned after every API usage.
 """
+import os
+import sys
 import time
+import hashlib
+import platform
 from functools import wraps
 
 from jedi import settings
+from jedi import debug
+from jedi._compatibility import pickle, pickle_load, pickle_dump
 from parso.cache import parser_cache
 
 _time_caches = {}
+_memoize_method_statistics = {}
 
 
 def clear_time_caches(delete_all=False):
@@ -100,15 +111,75 @@ def time_cache(seconds):
 
 def memoize_method(method):
     """A normal memoize function."""
+    statistics = _memoize_method_statistics[method] = [0, 0]
+
     @wraps(method)
     def wrapper(self, *args, **kwargs):
         cache_dict = self.__dict__.setdefault('_memoize_method_dct', {})
         dct = cache_dict.setdefault(method, {})
         key = (args, frozenset(kwargs.items()))
         try:
-            return dct[key]
+            result = dct[key]
         except KeyError:
+            statistics[1] += 1
             result = method(self, *args, **kwargs)
             dct[key] = result
             return result
+        statistics[0] += 1
+        return result
     return wrapper
+
+
+def get_memoize_method_statistics():
+    """
+    Returns a dict that maps the methods decorated with ``memoize_method`` to
+    a list with the number of hits and misses in this process. The results
+    are stored on the instances, so they go away with them.
+    """
+    return dict((method, list(s)) for method, s in _memoize_method_statistics.items())
+
+
+def _get_disk_cache_path(category, key):
+    from jedi import __version__
+    version_tag = 'jedi-%s-%s%s%s' % (
+        __version__,
+        platform.python_implementation(),
+        sys.version_info[0],
+        sys.version_info[1],
+    )
+    file_name = hashlib.sha256(key.encode('utf-8')).hexdigest() + '.pkl'
+    return os.path.join(settings.cache_directory, category, version_tag, file_name)
+
+
+def load_from_disk_cache(category, key):
+    """
+    Returns the data that was saved with :func:`save_to_disk_cache` or None if
+    there is nothing (usable) in the cache.
+
+    :param category: The name of the cache, e.g. ``'completion'``.
+    :param key: A string that has to contain everything the data depends on,
+        like paths and modification times.
+    """
+    try:
+        with open(_get_disk_cache_path(category, key), 'rb') as f:
+            return pickle_load(f)
+    except (IOError, OSError):
+        return None
+    except (EOFError, ValueError, pickle.UnpicklingError) as e:
+        debug.warning('Unable to load the %s cache: %s', category, e)
+        return None
+
+
+def save_to_disk_cache(category, key, data):
+    path = _get_disk_cache_path(category, key)
+    # Write to a temporary file first, other processes might be reading.
+    tmp_path = '%s.%s.tmp' % (path, os.getpid())
+    try:
+        directory = os.path.dirname(path)
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+        with open(tmp_path, 'wb') as f:
+            pickle_dump(data, f, pickle.HIGHEST_PROTOCOL)
+        getattr(os, 'replace', os.rename)(tmp_path, path)
+    except (IOError, OSError) as e:
+        debug.warning('Unable to save the %s cache: %s', category, e)
@@ -79,5 +79,15 @@ class FileIO(file_io.FileIO, FileIOFolderMixin):
     pass
 
 
+class GeneratedFileIO(file_io.KnownContentFileIO, FileIOFolderMixin):
+    """For code that was generated from the file at ``path``, e.g. stubs of C
+    extensions"""
+    def get_last_modified(self):
+        try:
+            return os.path.getmtime(self.path)
+        except OSError:  # Python 3 would probably only need FileNotFoundError
+            return None
+
+
 class KnownContentFileIO(file_io.KnownContentFileIO, FileIOFolderMixin):
     pass
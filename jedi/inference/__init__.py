@@ -62,15 +62,19 @@ I need to mention now that lazy type inference is really good because it
 only *inferes* what needs to be *inferred*. All the statements and modules
 that are not used are just being ignored.
 """
+import time
+from contextlib import contextmanager
+
 import parso
 from parso import python_bytes_to_unicode
 from jedi.file_io import FileIO
 
 from jedi import debug
 from jedi import settings
+from jedi.api.exceptions import CancelledError
 from jedi.inference import imports
 from jedi.inference import recursion
-from jedi.inference.cache import inference_state_function_cache
+from jedi.inference.cache import inference_state_function_cache, MemoizeCache
 from jedi.inference import helpers
 from jedi.inference.names import TreeNameDefinition
 from jedi.inference.base_value import ContextualizedNode, \
@@ -83,7 +87,8 @@ from jedi.plugins import plugin_manager
 
 
 class InferenceState(object):
-    def __init__(self, project, environment=None, script_path=None):
+    def __init__(self, project, environment=None, script_path=None,
+                 track_dependencies=False):
         if environment is None:
             environment = project.get_environment()
         self.environment = environment
@@ -92,19 +97,20 @@ class InferenceState(object):
         self.grammar = environment.get_grammar()
 
         self.latest_grammar = parso.load_grammar(version='3.7')
-        self.memoize_cache = {}  # for memoize decorators
+        # for memoize decorators
+        self.memoize_cache = MemoizeCache(track_dependencies=track_dependencies)
         self.module_cache = imports.ModuleCache()  # does the job of `sys.modules`.
         self.stub_module_cache = {}  # Dict[Tuple[str, ...], Optional[ModuleValue]]
-        self.compiled_cache = {}  # see `inference.compiled.create()`
         self.inferred_element_counts = {}
-        self.mixed_cache = {}  # see `inference.compiled.mixed._create()`
         self.analysis = []
         self.dynamic_params_depth = 0
         self.is_analysis = False
         self.project = project
-        self.access_cache = {}
         self.allow_descriptor_getattr = False
         self.flow_analysis_enabled = True
+        self.deadline = None
+        self.reached_deadline = False
+        self.cancellation_token = None
 
         self.reset_recursion_limitations()
 
@@ -115,6 +121,7 @@ class InferenceState(object):
     @staticmethod
     @plugin_manager.decorate()
     def execute(value, arguments):
+        value.inference_state.check_cancelled()
         debug.dbg('execute: %s %s', value, arguments)
         with debug.increase_indent_cm():
             value_set = value.py__call__(arguments=arguments)
@@ -136,10 +143,110 @@ class InferenceState(object):
         typing_module, = self.import_module((u'typing',))
         return typing_module
 
+    @contextmanager
+    def time_budget(self, timeout):
+        """
+        Inference stops descending after ``timeout`` seconds and returns what
+        was found until then. ``reached_deadline`` tells if that happened.
+        Without a timeout, an outer budget stays active.
+        """
+        if timeout is None:
+            yield
+            return
+        self.deadline = time.time() + timeout
+        self.reached_deadline = False
+        try:
+            yield
+        finally:
+            self.deadline = None
+            # Results that were cut short must not be reused. These are the
+            # ones that were finished after the deadline.
+            self.memoize_cache.remove_logged()
+
+    @contextmanager
+    def cancellable(self, token):
+        """
+        :meth:`check_cancelled` raises a ``CancelledError`` once the token is
+        cancelled. Without a token, an outer token stays active.
+        """
+        if token is None:
+            yield
+            return
+        self.cancellation_token = token
+        try:
+            yield
+        except CancelledError:
+            # Memoized functions remove their own unfinished entries.
+            self.reset_recursion_limitations()
+            raise
+        finally:
+            self.cancellation_token = None
+
+    def check_cancelled(self):
+        token = self.cancellation_token
+        if token is not None and token.cancelled:
+            debug.warning('Inference was cancelled')
+            raise CancelledError("The call was cancelled")
+
+    def is_past_deadline(self):
+        if self.deadline is None:
+            return False
+        if not self.reached_deadline:
+            if time.time() < self.deadline:
+                return False
+            debug.warning('Deadline reached, stopping inference')
+            self.reached_deadline = True
+            self.memoize_cache.start_logging()
+        return True
+
     def reset_recursion_limitations(self):
         self.recursion_detector = recursion.RecursionDetector()
         self.execution_recursion_detector = recursion.ExecutionRecursionDetector(self)
 
+    def prepare_for_script(self, script_path):
+        """
+        Makes it possible to reuse an inference state for a new script. Modules
+        and inferred results are kept, except for the ones that depend on
+        files that were changed in the meantime.
+
+        :returns: The module values that were removed, because their files
+            changed.
+        """
+        if script_path != self.script_path:
+            old_sys_path = self.get_sys_path()
+            self.script_path = script_path
+            # The sys path depends on the script path.
+            self.memoize_cache.clear_function(self.project._get_sys_path)
+            if self.get_sys_path() != old_sys_path:
+                # Imports might lead to different modules now.
+                debug.dbg('The sys path changed, clearing the memoize cache')
+                self.memoize_cache.clear()
+        removed = self.invalidate_changed_modules()
+        self.inferred_element_counts = {}
+        self.analysis = []
+        self.reset_recursion_limitations()
+        return removed
+
+    def invalidate_changed_modules(self):
+        removed = self.module_cache.remove_changed()
+        self.invalidate_modules(removed)
+        return removed
+
+    def invalidate_modules(self, modules):
+        """
+        Removes the stubs of the given module values and all results that
+        were inferred from them.
+        """
+        if not modules:
+            return
+        modules = list(modules)
+        for import_names, stub_module in list(self.stub_module_cache.items()):
+            if stub_module is not None \
+                    and any(v in modules for v in stub_module.non_stub_value_set):
+                del self.stub_module_cache[import_names]
+                modules.append(stub_module)
+        self.memoize_cache.invalidate(modules)
+
     def get_sys_path(self, **kwargs):
         """Convenience function"""
         return self.project._get_sys_path(self, **kwargs)
@@ -2,14 +2,244 @@
 - the popular ``_memoize_default`` works like a typical memoize and returns the
   default otherwise.
 - ``CachedMetaClass`` uses ``_memoize_default`` to do the same with classes.
+- ``MemoizeCache`` stores the results of all these decorators for one
+  inference state. If the inference state is reused, it remembers which
+  modules a result was inferred from, so the results of changed modules can
+  be thrown away.
 """
 
+from functools import wraps
+from collections import namedtuple, OrderedDict
+
 from jedi import debug
+from jedi import settings
+from jedi.common import BaseValueSet
 
 _NO_DEFAULT = object()
 _RECURSION_SENTINEL = object()
 
 
+def _get_modules(objects):
+    """
+    Returns the (non-compiled) module values that the given values, contexts
+    or names belong to. Lists, tuples and value sets are searched, too.
+    """
+    modules = set()
+    for obj in objects:
+        if isinstance(obj, (list, tuple, BaseValueSet)):
+            modules |= _get_modules(obj)
+            continue
+        # Wrappers and access handles forward attributes, which might even
+        # trigger inference. Only look at wrapped values that already exist.
+        while obj is not None and hasattr(type(obj), '__getattr__'):
+            obj = obj.__dict__.get('_wrapped_value')
+        if not hasattr(type(obj), 'get_root_context'):
+            continue
+        root_context = obj.get_root_context()
+        if not root_context.is_compiled():
+            modules.add(root_context.get_value())
+    return modules
+
+
+MemoizeStatistics = namedtuple('MemoizeStatistics', 'hits misses evictions size')
+
+
+class MemoizeCache(object):
+    """
+    The results of the memoize decorators of an inference state. Each entry
+    records the modules it depends on. These are the modules of the values in
+    its key and in its result and the dependencies of all entries that were
+    used while calculating it.
+
+    Collecting the dependencies is only worth it if the inference state is
+    reused, so it's only done with ``track_dependencies``. Otherwise
+    :meth:`invalidate` removes all entries.
+
+    If :data:`jedi.settings.memoize_cache_size` is set, the least recently
+    used entries of a function are removed once there are too many.
+    """
+    def __init__(self, track_dependencies=False):
+        self.track_dependencies = track_dependencies
+        # Dict[function, OrderedDict[key, Tuple[result, Set[ModuleValue]]]]
+        self._memos = {}
+        # Dict[function, List[int]], the hits, misses and evictions
+        self._statistics = {}
+        # Dict[ModuleValue, Set[Tuple[function, key]]]
+        self._dependents = {}
+        # A stack with the modules used by the calculations in progress.
+        self._recording = []
+        # Dict[Tuple[function, key], int], the entries that are calculated
+        # right now. They must not be evicted, because they contain the
+        # defaults that prevent recursion.
+        self._in_progress = {}
+        # The entries that were calculated since start_logging, None if
+        # nothing is logged.
+        self._logged = None
+
+    def _get_memo(self, function):
+        try:
+            return self._memos[function]
+        except KeyError:
+            self._memos[function] = memo = OrderedDict()
+            self._statistics.setdefault(function, [0, 0, 0])
+            return memo
+
+    def lookup(self, function, key):
+        """
+        Returns the result of an entry and marks its modules as used by the
+        calculation in progress. Raises a ``KeyError`` if there is no entry.
+        """
+        memo = self._get_memo(function)
+        try:
+            # Reinsert the entry, it's the most recently used one now.
+            memo[key] = entry = memo.pop(key)
+        except KeyError:
+            self._statistics[function][1] += 1
+            raise
+        self._statistics[function][0] += 1
+        result, modules = entry
+        if self._recording:
+            self._recording[-1] |= modules
+        return result
+
+    def set(self, function, key, result, modules=frozenset()):
+        memo = self._get_memo(function)
+        if not self.track_dependencies:
+            memo.pop(key, None)
+            memo[key] = result, frozenset()
+        else:
+            try:
+                _, dependencies = memo.pop(key)
+            except KeyError:
+                dependencies = set()
+            dependencies |= modules
+            dependencies |= _get_modules((key[0], key[1], result))
+            memo[key] = result, dependencies
+            for module in dependencies:
+                self._dependents.setdefault(module, set()).add((function, key))
+            if self._recording:
+                self._recording[-1] |= dependencies
+
+        limit = settings.memoize_cache_size
+        if limit is not None and len(memo) > limit:
+            self._evict(function, memo, len(memo) - limit)
+
+    def add_dependencies(self, function, key, modules):
+        """
+        Adds modules to the dependencies of an existing entry without looking
+        at its result again.
+        """
+        if not self.track_dependencies:
+            return
+        try:
+            _, dependencies = self._memos[function][key]
+        except KeyError:
+            return
+        new = modules - dependencies
+        if not new:
+            return
+        dependencies |= new
+        for module in new:
+            self._dependents.setdefault(module, set()).add((function, key))
+        if self._recording:
+            self._recording[-1] |= new
+
+    def _evict(self, function, memo, count):
+        old_keys = []
+        for old_key in memo:
+            if len(old_keys) == count:
+                break
+            if (function, old_key) not in self._in_progress:
+                old_keys.append(old_key)
+        for old_key in old_keys:
+            self._remove(function, old_key)
+        self._statistics[function][2] += len(old_keys)
+
+    def _remove(self, function, key):
+        _, dependencies = self._memos[function].pop(key)
+        for module in dependencies:
+            dependents = self._dependents.get(module)
+            if dependents is not None:
+                dependents.discard((function, key))
+
+    def start_recording(self, function, key):
+        self._recording.append(set())
+        self._in_progress[function, key] = self._in_progress.get((function, key), 0) + 1
+
+    def stop_recording(self, function, key):
+        count = self._in_progress.pop((function, key)) - 1
+        if count:
+            self._in_progress[function, key] = count
+        if self._logged is not None:
+            self._logged.add((function, key))
+        return self._recording.pop()
+
+    def discard(self, function, key):
+        """
+        Removes an entry if it exists, e.g. the default of a calculation that
+        was interrupted.
+        """
+        if key in self._memos.get(function, ()):
+            self._remove(function, key)
+
+    def start_logging(self):
+        """
+        Remembers the entries that are calculated from now on, so they can be
+        removed with :meth:`remove_logged`.
+        """
+        if self._logged is None:
+            self._logged = set()
+
+    def remove_logged(self):
+        logged = self._logged
+        self._logged = None
+        if logged:
+            for function, key in logged:
+                self.discard(function, key)
+            debug.dbg('Removed %s memoized results', len(logged))
+
+    def invalidate(self, modules):
+        """
+        Removes all entries that depend on one of the modules.
+        """
+        if not self.track_dependencies:
+            debug.dbg('Dependencies of %s are unknown, clearing memoized results',
+                      modules)
+            self.clear()
+            return
+        count = 0
+        for module in modules:
+            for function, key in self._dependents.pop(module, ()):
+                if key in self._memos[function]:
+                    self._remove(function, key)
+                    count += 1
+        debug.dbg('Removed %s memoized results of %s', count, modules)
+
+    def clear_function(self, function):
+        """
+        Removes all entries of a function. The function may also be the one
+        returned by a decorator.
+        """
+        function = getattr(function, '__wrapped__', function)
+        for key in list(self._memos.get(function, ())):
+            self._remove(function, key)
+
+    def clear(self):
+        for memo in self._memos.values():
+            memo.clear()
+        self._dependents.clear()
+
+    def get_statistics(self):
+        """
+        Returns a dict that maps the memoized functions to
+        :class:`MemoizeStatistics`. The size is the number of entries.
+        """
+        return dict(
+            (function, MemoizeStatistics(*(self._statistics[function] + [len(memo)])))
+            for function, memo in self._memos.items()
+        )
+
+
 def _memoize_default(default=_NO_DEFAULT, inference_state_is_first_arg=False,
                      second_arg_is_inference_state=False):
     """ This is a typical memoization decorator, BUT there is one difference:
@@ -20,6 +250,7 @@ def _memoize_default(default=_NO_DEFAULT, inference_state_is_first_arg=False,
     where recursion could happen (think about a = b; b = a).
     """
     def func(function):
+        @wraps(function)
         def wrapper(obj, *args, **kwargs):
             # TODO These checks are kind of ugly and slow.
             if inference_state_is_first_arg:
@@ -29,20 +260,27 @@ def _memoize_default(default=_NO_DEFAULT, inference_state_is_first_arg=False,
             else:
                 cache = obj.inference_state.memoize_cache
 
+            key = (obj, args, frozenset(kwargs.items()))
             try:
-                memo = cache[function]
+                return cache.lookup(function, key)
             except KeyError:
-                cache[function] = memo = {}
+                pass
 
-            key = (obj, args, frozenset(kwargs.items()))
-            if key in memo:
-                return memo[key]
-            else:
-                if default is not _NO_DEFAULT:
-                    memo[key] = default
+            if default is not _NO_DEFAULT:
+                cache.set(function, key, default)
+            cache.start_recording(function, key)
+            try:
                 rv = function(obj, *args, **kwargs)
-                memo[key] = rv
-                return rv
+            except BaseException:
+                # An interrupted calculation must not leave its default.
+                cache.discard(function, key)
+                raise
+            finally:
+                modules = cache.stop_recording(function, key)
+            cache.set(function, key, rv, modules)
+            return rv
+        # Python 2 doesn't set this in ``wraps``.
+        wrapper.__wrapped__ = function
         return wrapper
 
     return func
@@ -88,19 +326,13 @@ def inference_state_method_generator_cache():
     def func(function):
         def wrapper(obj, *args, **kwargs):
             cache = obj.inference_state.memoize_cache
+            key = (obj, args, frozenset(kwargs.items()))
             try:
-                memo = cache[function]
+                actual_generator, cached_lst = cache.lookup(function, key)
             except KeyError:
-                cache[function] = memo = {}
-
-            key = (obj, args, frozenset(kwargs.items()))
-
-            if key in memo:
-                actual_generator, cached_lst = memo[key]
-            else:
                 actual_generator = function(obj, *args, **kwargs)
                 cached_lst = []
-                memo[key] = actual_generator, cached_lst
+                cache.set(function, key, (actual_generator, cached_lst))
 
             i = 0
             while True:
@@ -112,11 +344,27 @@ def inference_state_method_generator_cache():
                         return
                 except IndexError:
                     cached_lst.append(_RECURSION_SENTINEL)
-                    next_element = next(actual_generator, None)
+                    # The entry with the sentinel must not be evicted while
+                    # the next element is calculated.
+                    cache.start_recording(function, key)
+                    try:
+                        next_element = next(actual_generator, None)
+                    except BaseException:
+                        # The generator is finished and the sentinel must
+                        # not stay.
+                        cache.discard(function, key)
+                        raise
+                    finally:
+                        modules = cache.stop_recording(function, key)
                     if next_element is None:
                         cached_lst.pop()
                         return
                     cached_lst[-1] = next_element
+                    # Only the new element is looked at, the dependencies of
+                    # the previous ones are known already.
+                    if cache.track_dependencies:
+                        cache.add_dependencies(
+                            function, key, modules | _get_modules([next_element]))
                 yield next_element
                 i += 1
         return wrapper
@@ -1,7 +1,9 @@
 from jedi._compatibility import unicode
 from jedi.inference.compiled.value import CompiledValue, CompiledName, \
-    CompiledValueFilter, CompiledValueName, create_from_access_path
+    CompiledValueFilter, CompiledValueName, create_from_access_path, \
+    prefetch_compiled_names, prefetch_compiled_docstrings
 from jedi.inference.base_value import LazyValueWrapper
+from jedi.inference.compiled import access_cache
 
 
 def builtin_from_name(inference_state, string):
@@ -57,12 +59,12 @@ def get_string_value_set(inference_state):
     return builtin_from_name(inference_state, u'str').execute_with_values()
 
 
-def load_module(inference_state, dotted_name, **kwargs):
+def load_module(inference_state, dotted_name, sys_path):
     # Temporary, some tensorflow builtins cannot be loaded, so it's tried again
     # and again and it's really slow.
     if dotted_name.startswith('tensorflow.'):
         return None
-    access_path = inference_state.compiled_subprocess.load_module(dotted_name=dotted_name, **kwargs)
+    access_path = access_cache.load_module(inference_state, dotted_name, sys_path)
     if access_path is None:
         return None
     return create_from_access_path(inference_state, access_path)
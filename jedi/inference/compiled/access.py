@@ -103,6 +103,11 @@ SignatureParam = namedtuple(
     'name has_default default default_string has_annotation annotation annotation_string kind_name'
 )
 
+AttributeDescription = namedtuple(
+    'AttributeDescription',
+    'name has_attribute is_descriptor access_paths api_type'
+)
+
 
 def shorten_repr(func):
     def wrapper(self):
@@ -118,6 +123,13 @@ def create_access(inference_state, obj):
 
 
 def load_module(inference_state, dotted_name, sys_path):
+    module = import_module(dotted_name, sys_path)
+    if module is None:
+        return None
+    return create_access_path(inference_state, module)
+
+
+def import_module(dotted_name, sys_path):
     temp, sys.path = sys.path, sys_path
     try:
         __import__(dotted_name)
@@ -136,8 +148,7 @@ def load_module(inference_state, dotted_name, sys_path):
 
     # Just access the cache after import, because of #59 as well as the very
     # complicated import structure of Python.
-    module = sys.modules[dotted_name]
-    return create_access_path(inference_state, module)
+    return sys.modules[dotted_name]
 
 
 class AccessPath(object):
@@ -551,6 +562,30 @@ class DirectObjectAccess(object):
         )
         return self.needs_type_completions(), tuples
 
+    def get_attribute_descriptions(self):
+        """
+        Like :meth:`get_dir_infos`, but also returns the access paths and API
+        types of all attributes that can be accessed without executing code.
+        This avoids a lot of calls when listing the members of an object.
+        """
+        needs_type_completions, dir_infos = self.get_dir_infos()
+        descriptions = []
+        for name, (has_attribute, is_descriptor) in dir_infos.items():
+            access_paths = api_type = None
+            if has_attribute and not is_descriptor:
+                try:
+                    access_paths = self.getattr_paths(name, default=None)
+                except Exception:
+                    # One broken attribute should not break the listing, it
+                    # will fail again once it's actually used.
+                    pass
+                else:
+                    api_type = access_paths[-1].access.get_api_type()
+            descriptions.append(AttributeDescription(
+                name, has_attribute, is_descriptor, access_paths, api_type
+            ))
+        return needs_type_completions, descriptions
+
 
 def _is_class_instance(obj):
     """Like inspect.* methods."""
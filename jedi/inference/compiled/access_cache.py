@@ -0,0 +1,365 @@
+"""
+Big C extensions like ``numpy`` or ``tensorflow`` take seconds to import in
+the compiled subprocess. Therefore the results of the subprocess calls for
+extension modules are remembered. If the files of such a module and the
+directories of the sys path did not change, the results are served from the
+cache and the module is not imported at all. With
+:data:`jedi.settings.save_extension_results` they are also saved in the cache
+directory.
+
+All calls on the access handles of such a module go through
+:class:`CachedAccessHandle`. It returns recorded results and only uses the
+subprocess (and therefore imports the module) for calls that were not recorded
+yet. Access handles in results are saved as the chain of calls that leads to
+them.
+
+If :data:`jedi.settings.generate_extension_stubs` is enabled, extension
+modules are not inspected at all. Instead a stub is generated once and saved
+in the cache directory as well, see :mod:`jedi.inference.compiled.stubgen`.
+"""
+import os
+import atexit
+from functools import partial
+from collections import OrderedDict
+
+from jedi import debug
+from jedi import settings
+from jedi._compatibility import force_unicode
+from jedi.cache import load_from_disk_cache, save_to_disk_cache
+from jedi.file_io import GeneratedFileIO
+from jedi.inference.compiled.access import AccessPath, SignatureParam, \
+    AttributeDescription
+from jedi.inference.compiled.subprocess import AccessHandle, \
+    InferenceStateSubprocess, restore_access_handle
+
+_EXTENSION_SUFFIXES = ('.so', '.pyd')
+_LOAD_MODULE_KEY = u'load_module', (), frozenset()
+
+_CALLS_CACHE_LIMIT = 50
+"""
+The results of this many modules are kept in memory.
+"""
+
+# OrderedDict[str, Dict[identity, Dict[call_key, Tuple[bool, object]]]]
+_calls_cache = OrderedDict()
+_unsaved = set()
+
+
+class _HandleReference(object):
+    """
+    Replaces access handles in the saved results.
+    """
+    def __init__(self, identity):
+        self.identity = identity
+
+
+class _NotRecordable(Exception):
+    pass
+
+
+def _convert_handles(obj, callback, types):
+    if isinstance(obj, types):
+        return callback(obj)
+    elif isinstance(obj, (SignatureParam, AttributeDescription)):
+        return type(obj)(*_convert_handles(tuple(obj), callback, types))
+    elif isinstance(obj, tuple):
+        return tuple(_convert_handles(o, callback, types) for o in obj)
+    elif isinstance(obj, list):
+        return [_convert_handles(o, callback, types) for o in obj]
+    elif isinstance(obj, AccessPath):
+        return AccessPath(_convert_handles(obj.accesses, callback, types))
+    return obj
+
+
+def _iter_handles(obj):
+    handles = []
+    _convert_handles(obj, handles.append, (AccessHandle, CachedAccessHandle))
+    return handles
+
+
+def _contains_handles(obj):
+    return bool(_iter_handles(obj))
+
+
+def _find_extension_files(dotted_name, sys_path):
+    parts = dotted_name.split('.')
+    files = []
+    for path in sys_path:
+        directory = os.path.join(path, *parts[:-1])
+        try:
+            file_names = sorted(os.listdir(directory))
+        except OSError:
+            continue
+        for file_name in file_names:
+            if file_name.startswith(parts[-1] + '.') \
+                    and file_name.endswith(_EXTENSION_SUFFIXES):
+                file_path = os.path.join(directory, file_name)
+                try:
+                    files.append((file_path, os.path.getmtime(file_path)))
+                except OSError:
+                    pass
+    return files
+
+
+def _get_key(inference_state, dotted_name, files, sys_path):
+    """
+    Extensions import other modules, which might change if packages are
+    installed or removed. This changes the directories of the sys path.
+    """
+    sys_path_state = []
+    for path in sys_path:
+        try:
+            sys_path_state.append((path, os.path.getmtime(path)))
+        except OSError:
+            pass
+    return repr((dotted_name, files, sys_path_state, inference_state.environment._sha256))
+
+
+def _get_calls(key):
+    try:
+        # Reinsert the module, it's the most recently used one now.
+        _calls_cache[key] = calls = _calls_cache.pop(key)
+        return calls
+    except KeyError:
+        pass
+    calls = None
+    if settings.save_extension_results:
+        calls = load_from_disk_cache('compiled', key)
+    _calls_cache[key] = calls = calls or {}
+    while len(_calls_cache) > _CALLS_CACHE_LIMIT:
+        old_key = next(iter(_calls_cache))
+        _save(old_key)
+        del _calls_cache[old_key]
+    return calls
+
+
+def load_module(inference_state, dotted_name, sys_path):
+    """
+    Like ``load_module`` of the compiled subprocess, but the returned access
+    handles use the cache if the module is a C extension.
+    """
+    compiled_subprocess = inference_state.compiled_subprocess
+    files = None
+    if isinstance(compiled_subprocess, InferenceStateSubprocess):
+        files = _find_extension_files(dotted_name, sys_path)
+    if not files:
+        # Only extension modules are cached. Other modules are cheap to
+        # import or have no file that tells us if they changed.
+        return compiled_subprocess.load_module(dotted_name=dotted_name, sys_path=sys_path)
+
+    key = _get_key(inference_state, dotted_name, files, sys_path)
+    calls = _get_calls(key)
+    record = _ModuleRecord(inference_state, key, calls, dotted_name, sys_path)
+    return record.load_module()
+
+
+def get_generated_stub(inference_state, dotted_name, sys_path):
+    """
+    Returns a file io with the code of a generated stub for an extension
+    module or None if it's not an extension module or it cannot be imported.
+    The file io has the path of the extension.
+    """
+    compiled_subprocess = inference_state.compiled_subprocess
+    if not isinstance(compiled_subprocess, InferenceStateSubprocess):
+        return None
+    files = _find_extension_files(dotted_name, sys_path)
+    if not files:
+        return None
+
+    key = _get_key(inference_state, dotted_name, files, sys_path)
+    code = load_from_disk_cache('stubs', key)
+    if code is None:
+        debug.dbg('Generate a stub for the compiled module %s', dotted_name)
+        code = compiled_subprocess.generate_stub(dotted_name=dotted_name, sys_path=sys_path)
+        if code is None:
+            return None
+        save_to_disk_cache('stubs', key, code)
+    return GeneratedFileIO(files[0][0], code)
+
+
+def _save(key):
+    if key not in _unsaved:
+        return
+    _unsaved.remove(key)
+    if not settings.save_extension_results:
+        return
+    # Exceptions are only remembered while the process runs.
+    calls = dict(
+        (identity, dict((k, v) for k, v in results.items() if not v[0]))
+        for identity, results in _calls_cache[key].items()
+    )
+    save_to_disk_cache('compiled', key, calls)
+
+
+def save_to_disk():
+    """
+    Saves the results of all modules that got new results, if
+    :data:`jedi.settings.save_extension_results` is enabled. This happens
+    automatically when Python exits.
+    """
+    for key in list(_unsaved):
+        _save(key)
+
+
+atexit.register(save_to_disk)
+
+
+class _ModuleRecord(object):
+    def __init__(self, inference_state, key, calls, dotted_name, sys_path):
+        self._inference_state = inference_state
+        self._key = key
+        self._calls = calls
+        self._dotted_name = dotted_name
+        self._sys_path = sys_path
+        self._handles = {}  # Dict[identity, CachedAccessHandle]
+        self._real_handles = {}  # Dict[identity, AccessHandle]
+        self._identities = {}  # Dict[int, identity], with the ids of handles
+
+    def _load_real_module(self):
+        debug.dbg('Load the compiled module %s, the cache is not enough', self._dotted_name)
+        return self._inference_state.compiled_subprocess.load_module(
+            dotted_name=self._dotted_name,
+            sys_path=self._sys_path,
+        )
+
+    def load_module(self):
+        return self.call((), _LOAD_MODULE_KEY, self._load_real_module)
+
+    def get_handle(self, identity):
+        try:
+            return self._handles[identity]
+        except KeyError:
+            handle = self._handles[identity] = CachedAccessHandle(self, identity)
+            return handle
+
+    def get_real_handle(self, identity):
+        try:
+            return self._real_handles[identity]
+        except KeyError:
+            pass
+        parent_identity = identity[:-1]
+        (name, args, kwargs), index = identity[-1]
+        if parent_identity:
+            result = self.get_real_handle(parent_identity)._cached_results(
+                name, *args, **dict(kwargs))
+        else:
+            result = self._load_real_module()
+        handle = _iter_handles(result)[index]
+        self._real_handles[identity] = handle
+        self._identities[handle.id] = identity
+        return handle
+
+    def has_result(self, identity, key):
+        return key in self._calls.get(identity, {})
+
+    def call(self, identity, key, real_callback):
+        try:
+            is_exception, result = self._calls[identity][key]
+        except KeyError:
+            try:
+                result = real_callback()
+            except Exception as e:
+                # Errors of this process (e.g. a MemoryError) must not be
+                # remembered.
+                if getattr(e, 'raised_in_subprocess', False):
+                    self._record(identity, key, True, e)
+                raise
+            if not self._record(identity, key, False, result):
+                return result
+            is_exception, result = self._calls[identity][key]
+
+        if is_exception:
+            raise result
+        return _convert_handles(
+            result,
+            lambda reference: self.get_handle(reference.identity),
+            _HandleReference,
+        )
+
+    def _record(self, identity, key, is_exception, result):
+        position = [0]
+
+        def to_reference(handle):
+            index = position[0]
+            position[0] += 1
+            if isinstance(handle, CachedAccessHandle):
+                if handle._record is not self:
+                    raise _NotRecordable
+                return _HandleReference(handle._identity)
+
+            try:
+                new_identity = self._identities[handle.id]
+            except KeyError:
+                new_identity = identity + ((key, index),)
+                self._identities[handle.id] = new_identity
+                self._real_handles[new_identity] = handle
+            return _HandleReference(new_identity)
+
+        try:
+            result = _convert_handles(result, to_reference, (AccessHandle, CachedAccessHandle))
+        except _NotRecordable:
+            return False
+        self._calls.setdefault(identity, {})[key] = is_exception, result
+        _unsaved.add(self._key)
+        return True
+
+    def set_result(self, identity, key, result):
+        self._record(identity, key, False, result)
+
+
+class CachedAccessHandle(object):
+    """
+    Has the same API as :class:`.AccessHandle`, but serves the results from
+    the cache if possible.
+    """
+    def __init__(self, record, identity):
+        self._record = record
+        self._identity = identity
+
+    @property
+    def id(self):
+        return self._record.get_real_handle(self._identity).id
+
+    def __repr__(self):
+        return '<%s: %s>' % (self.__class__.__name__, self._identity[-1][0][0])
+
+    def __reduce__(self):
+        # Handles that are arguments of calls to the subprocess are sent as
+        # the real handle.
+        return restore_access_handle, (self.id,)
+
+    def __getattr__(self, name):
+        if name in ('id', 'access') or name.startswith('_'):
+            raise AttributeError(name)
+        return partial(self._cached_results, force_unicode(name))
+
+    def _call_real(self, name, args, kwargs):
+        def to_real_handle(handle):
+            if isinstance(handle, CachedAccessHandle):
+                return handle._record.get_real_handle(handle._identity)
+            return handle
+
+        types = (AccessHandle, CachedAccessHandle)
+        args = _convert_handles(args, to_real_handle, types)
+        kwargs = dict((k, _convert_handles(v, to_real_handle, types))
+                      for k, v in kwargs.items())
+        real_handle = self._record.get_real_handle(self._identity)
+        return getattr(real_handle, name)(*args, **kwargs)
+
+    def _cached_results(self, name, *args, **kwargs):
+        if args and isinstance(args[0], slice) \
+                or _contains_handles(args) or _contains_handles(list(kwargs.values())):
+            # Slices are not hashable and results that depend on other
+            # handles are not recorded.
+            return self._call_real(name, args, kwargs)
+        key = name, args, frozenset(kwargs.items())
+        return self._record.call(
+            self._identity, key,
+            lambda: self._call_real(name, args, kwargs),
+        )
+
+    def _has_cached_result(self, name, args, kwargs):
+        return self._record.has_result(self._identity, (name, args, frozenset(kwargs.items())))
+
+    def _set_cached_result(self, name, args, kwargs, result):
+        self._record.set_result(self._identity, (name, args, frozenset(kwargs.items())), result)
@@ -0,0 +1,280 @@
+"""
+Generates the code of a Python module that has the same names, signatures and
+docstrings as an imported module. This is used for C extensions if
+:data:`jedi.settings.generate_extension_stubs` is enabled. The generated code
+is saved in the cache directory and used instead of importing the extension
+again.
+
+This runs in the compiled subprocess, therefore the code is valid for the
+Python version of the environment.
+"""
+import inspect
+import keyword
+import re
+import sys
+
+from jedi._compatibility import unicode, is_py3
+
+_MAX_LITERAL_LENGTH = 100
+_SIMPLE_TYPES = (bool, int, float, complex, str, bytes, unicode, type(None))
+_IGNORED_ATTRIBUTES = (
+    '__builtins__', '__dict__', '__doc__', '__file__', '__loader__',
+    '__module__', '__name__', '__package__', '__qualname__', '__slots__',
+    '__spec__', '__weakref__',
+)
+_RETURN_TYPE_PATTERN = re.compile(r'\)\s*->\s*(\w+)\s*$')
+
+_builtins = sys.modules['builtins' if is_py3 else '__builtin__']
+
+
+def _is_identifier(name):
+    return re.match(r'[a-zA-Z_]\w*$', name) is not None and not keyword.iskeyword(name)
+
+
+def _get_builtin_name(obj):
+    name = getattr(obj, '__name__', None)
+    if isinstance(name, str) and getattr(_builtins, name, None) is obj:
+        return name
+    return None
+
+
+def _get_docstring(obj):
+    try:
+        doc = obj.__doc__
+    except Exception:
+        return None
+    if isinstance(doc, (str, unicode)) and doc:
+        return doc
+    return None
+
+
+def _get_params(func, first_param=None):
+    try:
+        signature = inspect.signature(func)
+    except (AttributeError, TypeError, ValueError):
+        # There is no signature in Python 2 and for a lot of builtins.
+        params = ['*args', '**kwargs']
+    else:
+        params = []
+        has_star = has_default = False
+        for param in signature.parameters.values():
+            if not _is_identifier(param.name):
+                return _get_params(None, first_param)
+            if param.kind == param.VAR_POSITIONAL:
+                params.append('*' + param.name)
+                has_star = True
+            elif param.kind == param.VAR_KEYWORD:
+                params.append('**' + param.name)
+            else:
+                string = param.name
+                if param.kind == param.KEYWORD_ONLY:
+                    if not has_star:
+                        params.append('*')
+                        has_star = True
+                elif param.default is not param.empty:
+                    has_default = True
+                if has_default or param.default is not param.empty:
+                    # Defaults can have reprs that are not valid code.
+                    string += '=...'
+                params.append(string)
+    if first_param is not None and (not params or params[0] != first_param):
+        params.insert(0, first_param)
+    return params
+
+
+def _get_return_annotation(func):
+    """
+    C functions often document their return type in the first line of the
+    docstring, e.g. ``bin(number) -> str``.
+    """
+    if not is_py3:
+        return ''
+    doc = _get_docstring(func)
+    if doc is None:
+        return ''
+    match = _RETURN_TYPE_PATTERN.search(doc.split('\n', 1)[0])
+    if match is None:
+        return ''
+    name = match.group(1)
+    if isinstance(getattr(_builtins, name, None), type):
+        return ' -> ' + name
+    return ''
+
+
+class _StubGenerator(object):
+    def __init__(self, module):
+        self._module = module
+        self._module_name = module.__name__
+        self._imports = set()
+        # Classes of this module that are already written, by id.
+        self._class_names = {}
+        self._lines = []
+
+    def _add(self, indent, line):
+        self._lines.append('    ' * indent + line)
+
+    def _add_docstring(self, indent, obj):
+        doc = _get_docstring(obj)
+        if doc is not None:
+            self._add(indent, repr(doc))
+            return True
+        return False
+
+    def _get_reference(self, obj, allow_import=False):
+        """
+        Returns code that references a class or None.
+        """
+        name = _get_builtin_name(obj)
+        if name is not None:
+            return name
+        try:
+            return self._class_names[id(obj)]
+        except KeyError:
+            pass
+        if not allow_import:
+            return None
+        module_name = getattr(obj, '__module__', None)
+        name = getattr(obj, '__name__', None)
+        if not isinstance(module_name, str) or not isinstance(name, str) \
+                or not all(_is_identifier(n) for n in module_name.split('.') + [name]):
+            return None
+        if (module_name + '.').startswith(self._module_name + '.') \
+                or (self._module_name + '.').startswith(module_name + '.'):
+            # Importing parents or children of this module would be circular.
+            return None
+        self._imports.add(module_name)
+        return module_name + '.' + name
+
+    def _write_value(self, indent, name, value):
+        if isinstance(value, type):
+            reference = self._get_reference(value)
+            if reference is None:
+                self._write_class(indent, name, value)
+            else:
+                self._add(indent, '%s = %s' % (name, reference))
+        elif inspect.ismodule(value):
+            module_name = value.__name__
+            if all(_is_identifier(n) for n in module_name.split('.')):
+                self._add(indent, 'import %s as %s' % (module_name, name))
+        elif inspect.isroutine(value):
+            self._write_function(indent, name, value)
+        else:
+            self._write_variable(indent, name, value)
+
+    def _write_variable(self, indent, name, value):
+        if type(value) in _SIMPLE_TYPES:
+            literal = repr(value)
+            if len(literal) <= _MAX_LITERAL_LENGTH:
+                self._add(indent, '%s = %s' % (name, literal))
+                return
+        reference = self._get_reference(type(value)) or 'object'
+        self._add(indent, '%s = None  # type: %s' % (name, reference))
+
+    def _write_function(self, indent, name, func, first_param=None, decorator=None):
+        if decorator is not None:
+            self._add(indent, '@' + decorator)
+        self._add(indent, 'def %s(%s)%s:' % (
+            name,
+            ', '.join(_get_params(func, first_param)),
+            _get_return_annotation(func),
+        ))
+        if not self._add_docstring(indent + 1, func):
+            self._add(indent + 1, '...')
+
+    def _write_class(self, indent, name, cls):
+        bases = []
+        for base in cls.__bases__:
+            if base is not object:
+                reference = self._get_reference(base, allow_import=True)
+                if reference is not None:
+                    bases.append(reference)
+        if indent == 0:
+            self._class_names[id(cls)] = name
+        self._add(indent, 'class %s%s:' % (name, '(%s)' % ', '.join(bases) if bases else ''))
+        has_body = self._add_docstring(indent + 1, cls)
+
+        for attribute_name, raw in sorted(vars(cls).items()):
+            if not _is_identifier(attribute_name) or attribute_name in _IGNORED_ATTRIBUTES:
+                continue
+            has_body = True
+            if isinstance(raw, staticmethod):
+                self._write_function(indent + 1, attribute_name, raw.__func__,
+                                     decorator='staticmethod')
+            elif isinstance(raw, classmethod) or attribute_name == '__new__' \
+                    or type(raw).__name__ == 'classmethod_descriptor':
+                self._write_function(
+                    indent + 1, attribute_name, getattr(cls, attribute_name),
+                    first_param='cls',
+                    decorator=None if attribute_name == '__new__' else 'classmethod',
+                )
+            elif isinstance(raw, property) or inspect.isdatadescriptor(raw):
+                self._add(indent + 1, '@property')
+                self._add(indent + 1, 'def %s(self):' % attribute_name)
+                if not self._add_docstring(indent + 2, raw):
+                    self._add(indent + 2, '...')
+            elif inspect.isroutine(raw):
+                self._write_function(indent + 1, attribute_name, raw, first_param='self')
+            elif isinstance(raw, type) and indent < 2:
+                self._write_value(indent + 1, attribute_name, raw)
+            else:
+                self._write_variable(indent + 1, attribute_name, raw)
+
+        if not has_body:
+            self._add(indent + 1, '...')
+
+    def _iter_sorted_classes(self, classes):
+        """
+        Classes are written before the classes of this module that inherit
+        from them.
+        """
+        by_id = dict((id(cls), name) for name, cls in classes)
+        done = set()
+
+        def visit(name, cls):
+            if id(cls) in done:
+                return
+            done.add(id(cls))
+            for base in cls.__bases__:
+                if id(base) in by_id:
+                    for result in visit(by_id[id(base)], base):
+                        yield result
+            yield name, cls
+
+        for name, cls in classes:
+            for result in visit(name, cls):
+                yield result
+
+    def generate(self):
+        self._add_docstring(0, self._module)
+        body_start = len(self._lines)
+
+        classes = []
+        others = []
+        for name in sorted(dir(self._module)):
+            if not _is_identifier(name) or name in _IGNORED_ATTRIBUTES:
+                continue
+            try:
+                value = getattr(self._module, name)
+            except Exception:
+                continue
+            if isinstance(value, type) and _get_builtin_name(value) is None \
+                    and getattr(value, '__name__', None) == name:
+                classes.append((name, value))
+            else:
+                others.append((name, value))
+
+        for name, cls in self._iter_sorted_classes(classes):
+            self._write_value(0, name, cls)
+        for name, value in others:
+            self._write_value(0, name, value)
+
+        imports = ['import %s' % module_name for module_name in sorted(self._imports)]
+        self._lines[body_start:body_start] = imports
+        return '\n'.join(self._lines) + '\n'
+
+
+def generate_stub(module):
+    """
+    Returns the code of a stub for the given module object.
+    """
+    return _StubGenerator(module).generate()
@@ -13,8 +13,10 @@ import subprocess
 import socket
 import errno
 import traceback
+from contextlib import contextmanager
 from functools import partial
-from threading import Thread
+from threading import Thread, Event, RLock
+from weakref import WeakSet
 try:
     from queue import Queue, Empty
 except ImportError:
@@ -26,7 +28,7 @@ from jedi import debug
 from jedi.cache import memoize_method
 from jedi.inference.compiled.subprocess import functions
 from jedi.inference.compiled.access import DirectObjectAccess, AccessPath, \
-    SignatureParam
+    SignatureParam, AttributeDescription
 from jedi.api.exceptions import InternalError
 
 
@@ -54,6 +56,27 @@ def _get_function(name):
     return getattr(functions, name)
 
 
+def _delete_in_background(subprocess_ref, event):
+    """
+    Deletes inference states and access handles in the subprocess as soon as
+    they are not used anymore. Only a weakref to the subprocess is kept, so
+    this thread ends once the subprocess is gone.
+    """
+    while True:
+        event.wait(1)
+        event.clear()
+        subprocess = subprocess_ref()
+        if subprocess is None or subprocess.is_crashed:
+            return
+        try:
+            subprocess.flush_deletions()
+        except Exception as e:
+            # This thread must keep running, otherwise nothing is deleted
+            # anymore.
+            debug.warning('Deleting in the subprocess failed: %r', e)
+        del subprocess
+
+
 def _cleanup_process(process, thread):
     try:
         process.kill()
@@ -92,6 +115,15 @@ class _InferenceStateProcess(object):
     def set_access_handle(self, handle):
         self._handles[handle.id] = handle
 
+    def delete_access_handle(self, id_):
+        self._handles.pop(id_, None)
+
+    def prefetch_compiled_method_returns(self, calls):
+        """
+        Makes sure that the given ``(access_handle, name, args, kwargs)``
+        calls are cached. In the same process calls are cheap, so nothing happens here.
+        """
+
 
 class InferenceStateSameProcess(_InferenceStateProcess):
     """
@@ -99,15 +131,72 @@ class InferenceStateSameProcess(_InferenceStateProcess):
     as InferenceStateSubprocess and does the same thing without using a subprocess.
     This is necessary for the Interpreter process.
     """
+    is_crashed = False
+
     def __getattr__(self, name):
         return partial(_get_function(name), self._inference_state_weakref())
 
 
+class InferenceStateSandboxProcess(InferenceStateSameProcess):
+    """
+    Used for environments that use the running interpreter, see
+    :data:`jedi.settings.same_environment_in_process`. Modules that are
+    imported while inspecting are removed from ``sys.modules`` again and
+    changes to ``sys.path`` and the import hooks are reverted, so the running
+    program does not see them. This is not thread-safe if other threads
+    import modules at the same time.
+    """
+    def __init__(self, inference_state):
+        super(InferenceStateSandboxProcess, self).__init__(inference_state)
+        self._is_sandboxed = False
+
+    def __getattr__(self, name):
+        func = super(InferenceStateSandboxProcess, self).__getattr__(name)
+
+        def wrapper(*args, **kwargs):
+            with self._sandbox():
+                return func(*args, **kwargs)
+        return wrapper
+
+    @contextmanager
+    def _sandbox(self):
+        if self._is_sandboxed:
+            # Inspecting objects might call other functions.
+            yield
+            return
+
+        # Modules that were imported by the program are kept.
+        known_modules = set(sys.modules)
+        saved = [(name, getattr(sys, name), list(getattr(sys, name)))
+                 for name in ('path', 'meta_path', 'path_hooks')]
+        self._is_sandboxed = True
+        try:
+            yield
+        finally:
+            self._is_sandboxed = False
+            for module_name in set(sys.modules) - known_modules:
+                del sys.modules[module_name]
+            for name, list_, content in saved:
+                list_[:] = content
+                setattr(sys, name, list_)
+
+
 class InferenceStateSubprocess(_InferenceStateProcess):
     def __init__(self, inference_state, compiled_subprocess):
         super(InferenceStateSubprocess, self).__init__(inference_state)
         self._used = False
         self._compiled_subprocess = compiled_subprocess
+        # Access handles are only referenced weakly. The ids of handles that
+        # are garbage collected are appended here and the subprocess deletes
+        # them as well.
+        self._deleted_handle_ids = queue.deque()
+        # The set is iterated by the deletion thread.
+        with compiled_subprocess.lock:
+            compiled_subprocess._inference_state_processes.add(self)
+
+    @property
+    def is_crashed(self):
+        return self._compiled_subprocess.is_crashed
 
     def __getattr__(self, name):
         func = _get_function(name)
@@ -115,22 +204,77 @@ class InferenceStateSubprocess(_InferenceStateProcess):
         def wrapper(*args, **kwargs):
             self._used = True
 
-            result = self._compiled_subprocess.run(
-                self._inference_state_weakref(),
-                func,
-                args=args,
-                kwargs=kwargs,
-            )
-            # IMO it should be possible to create a hook in pickle.load to
-            # mess with the loaded objects. However it's extremely complicated
-            # to work around this so just do it with this call. ~ dave
-            return self._convert_access_handles(result)
+            # The handles need to be converted before deleted handles are
+            # flushed, otherwise a handle of the result might be deleted.
+            with self._compiled_subprocess.lock:
+                result = self._compiled_subprocess.run(
+                    self._inference_state_weakref(),
+                    func,
+                    args=args,
+                    kwargs=kwargs,
+                )
+                # IMO it should be possible to create a hook in pickle.load to
+                # mess with the loaded objects. However it's extremely complicated
+                # to work around this so just do it with this call. ~ dave
+                return self._convert_access_handles(result)
 
         return wrapper
 
+    def prefetch_compiled_method_returns(self, calls):
+        """
+        Runs all the calls that are not cached yet in one round trip and
+        caches their results on the access handles.
+        """
+        calls = [call for call in calls if not call[0]._has_cached_result(*call[1:])]
+        if not calls:
+            return
+        results = self.get_compiled_method_returns(
+            [(handle.id, name, args, kwargs) for handle, name, args, kwargs in calls]
+        )
+        for (handle, name, args, kwargs), (is_exception, result) in zip(calls, results):
+            # Failed calls are not cached, they raise once they are used.
+            if not is_exception:
+                handle._set_cached_result(name, args, kwargs, result)
+
+    def get_access_handle(self, id_):
+        handle = self._handles[id_]()
+        if handle is None:
+            raise KeyError(id_)
+        return handle
+
+    def set_access_handle(self, handle):
+        deleted_handle_ids = self._deleted_handle_ids
+        event = self._compiled_subprocess.deletion_event
+
+        def on_delete(ref, id_=handle.id):
+            # Don't reference self here, this would keep it alive.
+            deleted_handle_ids.append(id_)
+            event.set()
+
+        self._handles[handle.id] = weakref.ref(handle, on_delete)
+
+    def pop_deleted_handle_ids(self):
+        """
+        Returns the ids of access handles that were garbage collected and were
+        not replaced by new handles in the meantime.
+        """
+        ids = []
+        while True:
+            try:
+                id_ = self._deleted_handle_ids.popleft()
+            except IndexError:
+                break
+            ref = self._handles.get(id_)
+            if ref is not None and ref() is None:
+                del self._handles[id_]
+                ids.append(id_)
+        return ids
+
     def _convert_access_handles(self, obj):
         if isinstance(obj, SignatureParam):
             return SignatureParam(*self._convert_access_handles(tuple(obj)))
+        elif isinstance(obj, AttributeDescription):
+            return AttributeDescription(*self._convert_access_handles(tuple(obj)))
         elif isinstance(obj, tuple):
             return tuple(self._convert_access_handles(o) for o in obj)
         elif isinstance(obj, list):
@@ -159,6 +303,10 @@ class CompiledSubprocess(object):
     def __init__(self, executable):
         self._executable = executable
         self._inference_state_deletion_queue = queue.deque()
+        self._inference_state_processes = WeakSet()
+        # Sending a request and reading its response is not thread-safe.
+        self.lock = RLock()
+        self.deletion_event = Event()
         self._cleanup_callable = lambda: None
 
     def __repr__(self):
@@ -197,6 +345,12 @@ class CompiledSubprocess(object):
         )
         t.daemon = True
         t.start()
+        deletion_thread = Thread(
+            target=_delete_in_background,
+            args=(weakref.ref(self), self.deletion_event)
+        )
+        deletion_thread.daemon = True
+        deletion_thread.start()
         # Ensure the subprocess is properly cleaned up when the object
         # is garbage collected.
         self._cleanup_callable = weakref.finalize(self,
@@ -205,82 +359,133 @@ class CompiledSubprocess(object):
                                                   t)
         return process
 
-    def run(self, inference_state, function, args=(), kwargs={}):
-        # Delete old inference_states.
+    def _get_deletion_requests(self):
+        # Needs the lock, because the deletion thread calls this as well.
+        requests = []
+        # Delete handles first, otherwise a deleted inference state would be
+        # created again.
+        for process in list(self._inference_state_processes):
+            ids = process.pop_deleted_handle_ids()
+            if ids:
+                requests.append((process._inference_state_id,
+                                 functions.delete_access_handles, (ids,), {}))
         while True:
             try:
                 inference_state_id = self._inference_state_deletion_queue.pop()
             except IndexError:
                 break
             else:
-                self._send(inference_state_id, None)
+                requests.append((inference_state_id, None, (), {}))
+        return requests
+
+    def flush_deletions(self):
+        """
+        Deletes the inference states and access handles that are not used
+        anymore in the subprocess.
+        """
+        with self.lock:
+            requests = self._get_deletion_requests()
+            if requests:
+                self._send_many(requests)
 
+    def run(self, inference_state, function, args=(), kwargs={}):
         assert callable(function)
-        return self._send(id(inference_state), function, args, kwargs)
+        with self.lock:
+            # Delete old inference_states in the same round trip.
+            requests = self._get_deletion_requests()
+            requests.append((id(inference_state), function, args, kwargs))
+            return self._send_many(requests)[-1]
 
     def get_sys_path(self):
         return self._send(None, functions.get_sys_path, (), {})
 
+    def get_inference_state_count(self):
+        with self.lock:
+            return len(self._inference_state_processes)
+
     def _kill(self):
         self.is_crashed = True
         self._cleanup_callable()
 
     def _send(self, inference_state_id, function, args=(), kwargs={}):
+        return self._send_many([(inference_state_id, function, args, kwargs)])[0]
+
+    def _send_many(self, requests):
+        """
+        Pipelines the requests: They are all written before any result is read.
+        This only works well if all but the last result are small, otherwise
+        the subprocess might block writing them while we are still writing
+        requests.
+        """
+        with self.lock:
+            return self._send_many_unlocked(requests)
+
+    def _send_many_unlocked(self, requests):
         if self.is_crashed:
             raise InternalError("The subprocess %s has crashed." % self._executable)
 
-        if not is_py3:
-            # Python 2 compatibility
-            kwargs = {force_unicode(key): value for key, value in kwargs.items()}
-
-        data = inference_state_id, function, args, kwargs
-        try:
-            pickle_dump(data, self._get_process().stdin, self._pickle_protocol)
-        except (socket.error, IOError) as e:
-            # Once Python2 will be removed we can just use `BrokenPipeError`.
-            # Also, somehow in windows it returns EINVAL instead of EPIPE if
-            # the subprocess dies.
-            if e.errno not in (errno.EPIPE, errno.EINVAL):
-                # Not a broken pipe
-                raise
-            self._kill()
-            raise InternalError("The subprocess %s was killed. Maybe out of memory?"
-                                % self._executable)
+        for inference_state_id, function, args, kwargs in requests:
+            if not is_py3:
+                # Python 2 compatibility
+                kwargs = {force_unicode(key): value for key, value in kwargs.items()}
 
-        try:
-            is_exception, traceback, result = pickle_load(self._get_process().stdout)
-        except EOFError as eof_error:
+            data = inference_state_id, function, args, kwargs
             try:
-                stderr = self._get_process().stderr.read().decode('utf-8', 'replace')
-            except Exception as exc:
-                stderr = '<empty/not available (%r)>' % exc
-            self._kill()
-            _add_stderr_to_debug(self._stderr_queue)
-            raise InternalError(
-                "The subprocess %s has crashed (%r, stderr=%s)." % (
-                    self._executable,
-                    eof_error,
-                    stderr,
-                ))
+                pickle_dump(data, self._get_process().stdin, self._pickle_protocol)
+            except (socket.error, IOError) as e:
+                # Once Python2 will be removed we can just use `BrokenPipeError`.
+                # Also, somehow in windows it returns EINVAL instead of EPIPE if
+                # the subprocess dies.
+                if e.errno not in (errno.EPIPE, errno.EINVAL):
+                    # Not a broken pipe
+                    raise
+                self._kill()
+                raise InternalError("The subprocess %s was killed. Maybe out of memory?"
+                                    % self._executable)
+
+        results = []
+        exception = None
+        for _ in requests:
+            try:
+                is_exception, traceback, result = pickle_load(self._get_process().stdout)
+            except EOFError as eof_error:
+                try:
+                    stderr = self._get_process().stderr.read().decode('utf-8', 'replace')
+                except Exception as exc:
+                    stderr = '<empty/not available (%r)>' % exc
+                self._kill()
+                _add_stderr_to_debug(self._stderr_queue)
+                raise InternalError(
+                    "The subprocess %s has crashed (%r, stderr=%s)." % (
+                        self._executable,
+                        eof_error,
+                        stderr,
+                    ))
+
+            if is_exception and exception is None:
+                # Replace the attribute error message with a the traceback.
+                # It's way more informative. All results need to be read
+                # before raising, otherwise they would be read by the next
+                # request.
+                result.args = (traceback,)
+                result.raised_in_subprocess = True
+                exception = result
+            results.append(result)
 
         _add_stderr_to_debug(self._stderr_queue)
 
-        if is_exception:
-            # Replace the attribute error message with a the traceback. It's
-            # way more informative.
-            result.args = (traceback,)
-            raise result
-        return result
+        if exception is not None:
+            raise exception
+        return results
 
     def delete_inference_state(self, inference_state_id):
         """
-        Currently we are not deleting inference_state instantly. They only get
-        deleted once the subprocess is used again. It would probably a better
-        solution to move all of this into a thread. However, the memory usage
-        of a single inference_state shouldn't be that high.
+        The inference_state is deleted by a background thread, because this
+        is called while garbage collecting and the subprocess might be in use.
         """
         # With an argument - the inference_state gets deleted.
         self._inference_state_deletion_queue.append(inference_state_id)
+        self.deletion_event.set()
 
 
 class Listener(object):
@@ -357,6 +562,15 @@ class Listener(object):
             pickle_dump(result, stdout, self._pickle_protocol)
 
 
+def restore_access_handle(id_):
+    """
+    Unpickles an access handle that was pickled by its id.
+    """
+    handle = AccessHandle.__new__(AccessHandle)
+    handle.__setstate__(id_)
+    return handle
+
+
 class AccessHandle(object):
     def __init__(self, subprocess, access, id_):
         self.access = access
@@ -397,6 +611,21 @@ class AccessHandle(object):
             return self._subprocess.get_compiled_method_return(self.id, name, *args, **kwargs)
         return self._cached_results(name, *args, **kwargs)
 
-    @memoize_method
     def _cached_results(self, name, *args, **kwargs):
-        return self._subprocess.get_compiled_method_return(self.id, name, *args, **kwargs)
+        key = name, args, frozenset(kwargs.items())
+        # Unpickled handles don't call __init__, therefore use the __dict__.
+        cache = self.__dict__.setdefault('_results', {})
+        try:
+            return cache[key]
+        except KeyError:
+            result = self._subprocess.get_compiled_method_return(self.id, name, *args, **kwargs)
+            cache[key] = result
+            return result
+
+    def _has_cached_result(self, name, args, kwargs):
+        key = name, args, frozenset(kwargs.items())
+        return key in self.__dict__.get('_results', {})
+
+    def _set_cached_result(self, name, args, kwargs, result):
+        key = name, args, frozenset(kwargs.items())
+        self.__dict__.setdefault('_results', {})[key] = result
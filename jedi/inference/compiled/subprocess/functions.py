@@ -7,6 +7,7 @@ import inspect
 from jedi._compatibility import find_module, cast_path, force_unicode, \
     all_suffixes, scandir
 from jedi.inference.compiled import access
+from jedi.inference.compiled import stubgen
 from jedi import debug
 from jedi import parser_utils
 
@@ -15,15 +16,60 @@ def get_sys_path():
     return list(map(cast_path, sys.path))
 
 
+def import_modules(module_names):
+    """
+    Imports modules ahead of time, so they are not imported once they are
+    needed.
+    """
+    for module_name in module_names:
+        try:
+            __import__(module_name)
+        except Exception:
+            print('Module %s could not be preloaded.' % module_name, file=sys.stderr)
+
+
 def load_module(inference_state, **kwargs):
     return access.load_module(inference_state, **kwargs)
 
 
+def generate_stub(inference_state, dotted_name, sys_path):
+    module = access.import_module(dotted_name, sys_path)
+    if module is None:
+        return None
+    return stubgen.generate_stub(module)
+
+
 def get_compiled_method_return(inference_state, id, attribute, *args, **kwargs):
     handle = inference_state.compiled_subprocess.get_access_handle(id)
     return getattr(handle.access, attribute)(*args, **kwargs)
 
 
+def get_compiled_method_returns(inference_state, calls):
+    """
+    Runs a list of ``(id, attribute, args, kwargs)`` calls at once, which
+    avoids a round trip per call. Returns ``(is_exception, result)`` tuples.
+    """
+    results = []
+    for id, attribute, args, kwargs in calls:
+        try:
+            result = get_compiled_method_return(inference_state, id, attribute,
+                                                *args, **kwargs)
+        except Exception:
+            results.append((True, None))
+        else:
+            results.append((False, result))
+    return results
+
+
+def delete_access_handles(inference_state, ids):
+    """
+    Forgets the access handles that are not used by the parent process
+    anymore, so their objects can be garbage collected.
+    """
+    for id_ in ids:
+        inference_state.compiled_subprocess.delete_access_handle(id_)
+
+
 def create_simple_object(inference_state, obj):
     return access.create_access_path(inference_state, obj)
 
@@ -54,6 +100,13 @@ def _test_raise_error(inference_state, exception_type):
     raise exception_type
 
 
+def _test_get_access_handle_count(inference_state):
+    """
+    Returns the number of access handles of an inference state for unit tests.
+    """
+    return len(inference_state.compiled_subprocess._handles)
+
+
 def _test_print(inference_state, stderr=None, stdout=None):
     """
     Force some prints in the subprocesses. This exists for unit tests.
@@ -82,9 +135,11 @@ def safe_literal_eval(inference_state, value):
     return parser_utils.safe_literal_eval(value)
 
 
-def iter_module_names(*args, **kwargs):
-    return list(_iter_module_names(*args, **kwargs))
-    return sorted(set(_iter_module_names(*args, **kwargs)))
+def get_module_names_per_path(inference_state, paths):
+    """
+    Returns a list of module names for every path.
+    """
+    return [list(_iter_module_names(inference_state, [path])) for path in paths]
 
 
 def _iter_module_names(inference_state, paths):
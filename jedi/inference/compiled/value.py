@@ -487,17 +487,27 @@ class CompiledValueFilter(AbstractFilter):
     def values(self):
         from jedi.inference.compiled import builtin_from_name
         names = []
-        needs_type_completions, dir_infos = self.compiled_value.access_handle.get_dir_infos()
-        # We could use `unsafe` here as well, especially as a parameter to
-        # get_dir_infos. But this would lead to a lot of property executions
-        # that are probably not wanted. The drawback for this is that we
-        # have a different name for `get` and `values`. For `get` we always
-        # execute.
-        for name in dir_infos:
+        access_handle = self.compiled_value.access_handle
+        needs_type_completions, descriptions = access_handle.get_attribute_descriptions()
+        dir_names = set(d.name for d in descriptions)
+        for description in descriptions:
+            name = description.name
+            if description.access_paths is not None:
+                # Inferring the names and their API types doesn't need any
+                # additional calls this way.
+                access_handle._set_cached_result(
+                    u'getattr_paths', (name,), {'default': None}, description.access_paths)
+                description.access_paths[-1]._set_cached_result(
+                    u'get_api_type', (), {}, description.api_type)
+            # We could use `unsafe` here as well, especially as a parameter to
+            # get_attribute_descriptions. But this would lead to a lot of
+            # property executions that are probably not wanted. The drawback
+            # for this is that we have a different name for `get` and
+            # `values`. For `get` we always execute.
             names += self._get(
                 name,
-                lambda name, unsafe: dir_infos[name],
-                lambda name: name in dir_infos,
+                lambda name, unsafe: (description.has_attribute, description.is_descriptor),
+                lambda name: name in dir_names,
             )
 
         # ``dir`` doesn't include the type names.
@@ -603,6 +613,51 @@ def create_from_name(inference_state, compiled_value, name):
     return value
 
 
+def _prefetch_compiled_name_accesses(inference_state, names, method_names):
+    """
+    Calls ``method_names`` without arguments on the accesses of all compiled
+    names with two round trips to the subprocess instead of two per name.
+    """
+    compiled_subprocess = inference_state.compiled_subprocess
+    calls = [
+        (n._parent_value.access_handle, u'getattr_paths', (n.string_name,), {'default': None})
+        for n in names if isinstance(n, CompiledName)
+    ]
+    parent_handles = set(call[0] for call in calls)
+    compiled_subprocess.prefetch_compiled_method_returns(
+        calls + [(access_handle, u'is_class', (), {}) for access_handle in parent_handles]
+    )
+
+    access_handles = []
+    for access_handle, method_name, args, kwargs in calls:
+        if access_handle._has_cached_result(method_name, args, kwargs):
+            access_paths = access_handle._cached_results(method_name, *args, **kwargs)
+            if access_paths:
+                access_handles.append(access_paths[-1])
+    compiled_subprocess.prefetch_compiled_method_returns([
+        (access_handle, method_name, (), {})
+        for access_handle in access_handles
+        for method_name in method_names
+    ])
+
+
+def prefetch_compiled_names(inference_state, names):
+    """
+    Fetches what is needed to infer compiled names and their API types.
+    """
+    _prefetch_compiled_name_accesses(inference_state, names, [u'get_api_type'])
+
+
+def prefetch_compiled_docstrings(inference_state, names):
+    """
+    Fetches the docstrings and signatures of compiled names.
+    """
+    _prefetch_compiled_name_accesses(
+        inference_state, names,
+        [u'get_api_type', u'py__doc__', u'get_signature_params', u'ismethoddescriptor'],
+    )
+
+
 def _normalize_create_args(func):
     """The cache doesn't care about keyword vs. normal args."""
     def wrapper(inference_state, obj, parent_context=None):
@@ -3,6 +3,7 @@ import re
 from functools import wraps
 
 from jedi import settings
+from jedi.cache import load_from_disk_cache, save_to_disk_cache
 from jedi.file_io import FileIO
 from jedi._compatibility import FileNotFoundError, cast_path
 from jedi.parser_utils import get_cached_code_lines
@@ -85,10 +86,30 @@ def _cache_stub_file_map(version_info):
         pass
 
     _version_cache[version] = file_set = \
-        _merge_create_stub_map(_get_typeshed_directories(version_info))
+        _load_stub_file_map(list(_get_typeshed_directories(version_info)))
     return file_set
 
 
+def _load_stub_file_map(directories):
+    """
+    Listing all the typeshed directories is slow when the file system cache is
+    cold, so the map is also saved to disk. The modification times of the
+    directories change if stubs are added or removed.
+    """
+    def get_last_modified(directory):
+        try:
+            return os.path.getmtime(directory)
+        except OSError:
+            return None
+
+    key = repr([(d, get_last_modified(d)) for d in directories])
+    map_ = load_from_disk_cache('typeshed', key)
+    if map_ is None:
+        map_ = _merge_create_stub_map(directories)
+        save_to_disk_cache('typeshed', key, map_)
+    return map_
+
+
 def import_module_decorator(func):
     @wraps(func)
     def wrapper(inference_state, import_names, parent_module_value, sys_path, prefer_stubs):
@@ -24,6 +24,7 @@ from jedi.parser_utils import get_cached_code_lines
 from jedi.inference import sys_path
 from jedi.inference import helpers
 from jedi.inference import compiled
+from jedi.inference.compiled.access_cache import get_generated_stub
 from jedi.inference import analysis
 from jedi.inference.utils import unite
 from jedi.inference.cache import inference_state_method_cache
@@ -37,14 +38,36 @@ from jedi.plugins import plugin_manager
 class ModuleCache(object):
     def __init__(self):
         self._name_cache = {}
+        # Dict[Tuple[str, ...], List[Tuple[FileIO, Optional[float]]]]
+        self._last_modified = {}
 
     def add(self, string_names, value_set):
         if string_names is not None:
             self._name_cache[string_names] = value_set
+            self._last_modified[string_names] = [
+                (value.file_io, value.file_io.get_last_modified())
+                for value in value_set
+                if getattr(value, 'file_io', None) is not None
+            ]
 
     def get(self, string_names):
         return self._name_cache.get(string_names)
 
+    def remove_changed(self):
+        """
+        Removes all modules whose files were modified after they have been
+        added to the cache.
+
+        :returns: list of the removed module values
+        """
+        removed = []
+        for string_names, file_ios in list(self._last_modified.items()):
+            if any(file_io.get_last_modified() != last_modified
+                   for file_io, last_modified in file_ios):
+                removed += self._name_cache.pop(string_names)
+                del self._last_modified[string_names]
+        return removed
+
 
 # This memoization is needed, because otherwise we will infinitely loop on
 # certain imports.
@@ -456,6 +479,11 @@ def _load_builtin_module(inference_state, import_names=None, sys_path=None):
 
     dotted_name = '.'.join(import_names)
     assert dotted_name is not None
+    if settings.generate_extension_stubs:
+        file_io = get_generated_stub(inference_state, dotted_name, sys_path)
+        if file_io is not None:
+            return _load_python_module(inference_state, file_io,
+                                       import_names=import_names, is_package=False)
     module = compiled.load_module(inference_state, dotted_name=dotted_name, sys_path=sys_path)
     if module is None:
         # The file might raise an ImportError e.g. and therefore not be
@@ -548,6 +576,92 @@ def follow_error_node_imports_if_possible(context, name):
     return None
 
 
+# Dict[Tuple[executable, path], Tuple[directory state, List[str]]]
+_module_names_cache = {}
+# Dict[executable, List[str]]
+_builtin_module_names_cache = {}
+
+
+def _get_directory_state(path):
+    """
+    Returns the modification times of a directory and of its subdirectories
+    or None if the directory doesn't exist. Subdirectories are modified when
+    they gain or lose an ``__init__.py``, which makes them packages or not.
+    """
+    try:
+        modified = os.path.getmtime(path)
+        file_names = os.listdir(path)
+    except OSError:
+        return None
+    subdirectories = []
+    for file_name in sorted(file_names):
+        subdirectory = os.path.join(path, file_name)
+        try:
+            if os.path.isdir(subdirectory):
+                subdirectories.append((subdirectory, os.path.getmtime(subdirectory)))
+        except OSError:
+            # Removed in the meantime.
+            pass
+    return modified, tuple(subdirectories)
+
+
+def _is_directory_unchanged(path, state):
+    modified, subdirectories = state
+    try:
+        return os.path.getmtime(path) == modified and all(
+            os.path.getmtime(subdirectory) == subdirectory_modified
+            for subdirectory, subdirectory_modified in subdirectories
+        )
+    except OSError:
+        return False
+
+
+def get_module_names(inference_state, paths):
+    """
+    Returns the names of the modules in the given directories. The names of a
+    directory are cached for all inference states until the directory or one
+    of its subdirectories is modified, which happens when files are added or
+    removed.
+    """
+    executable = inference_state.environment.executable
+    names_per_path = {}
+    missing = []
+    for path in paths:
+        try:
+            state, names = _module_names_cache[executable, path]
+        except KeyError:
+            pass
+        else:
+            if _is_directory_unchanged(path, state):
+                names_per_path[path] = names
+                continue
+        state = _get_directory_state(path)
+        if state is not None:
+            missing.append((path, state))
+
+    if missing:
+        list_of_names = inference_state.compiled_subprocess.get_module_names_per_path(
+            [path for path, state in missing]
+        )
+        for (path, state), names in zip(missing, list_of_names):
+            _module_names_cache[executable, path] = state, names
+            names_per_path[path] = names
+
+    for path in paths:
+        for name in names_per_path.get(path, ()):
+            yield name
+
+
+def _get_builtin_module_names(inference_state):
+    executable = inference_state.environment.executable
+    try:
+        return _builtin_module_names_cache[executable]
+    except KeyError:
+        names = inference_state.compiled_subprocess.get_builtin_module_names()
+        _builtin_module_names_cache[executable] = names
+        return names
+
+
 def iter_module_names(inference_state, module_context, search_path,
                       module_cls=ImportName, add_builtin_modules=True):
     """
@@ -556,8 +670,8 @@ def iter_module_names(inference_state, module_context, search_path,
     """
     # add builtin module names
     if add_builtin_modules:
-        for name in inference_state.compiled_subprocess.get_builtin_module_names():
+        for name in _get_builtin_module_names(inference_state):
             yield module_cls(module_context, name)
 
-    for name in inference_state.compiled_subprocess.iter_module_names(search_path):
+    for name in get_module_names(inference_state, search_path):
         yield module_cls(module_context, name)
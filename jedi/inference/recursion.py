@@ -123,6 +123,9 @@ class ExecutionRecursionDetector(object):
             # they usually just help a lot with getting good results.
             return False
 
+        if self._inference_state.is_past_deadline():
+            return True
+
         if self._recursion_level > recursion_limit:
             debug.warning('Recursion limit (%s) reached', recursion_limit)
             return True
@@ -1,9 +1,16 @@
 import os
 import re
+import atexit
+from collections import deque, OrderedDict
+try:
+    from concurrent.futures import ThreadPoolExecutor
+except ImportError:  # Python 2
+    ThreadPoolExecutor = None
 
 from parso import python_bytes_to_unicode
 
 from jedi.debug import dbg
+from jedi.cache import load_from_disk_cache, save_to_disk_cache
 from jedi.file_io import KnownContentFileIO
 from jedi.inference.imports import SubModuleName, load_module_from_path
 from jedi.inference.filters import ParserTreeFilter
@@ -24,6 +31,99 @@ For now we keep the amount of parsed files really low, since parsing might take
 easily 100ms for bigger files.
 """
 
+_FILE_READER_THREADS = 8
+"""
+Reading files is mostly waiting for the file system, so it's done in threads.
+"""
+
+_file_reader_executor = None
+
+_IDENTIFIER_REGEX = re.compile(r'\w+', re.UNICODE)
+
+_IDENTIFIER_INDEX_DIRECTORY_LIMIT = 500
+"""
+The identifiers of files are kept in memory for this many directories. The
+least recently used directories are removed from memory, they are still saved
+in the cache directory.
+"""
+
+_SKIPPED = object()
+
+
+class _IdentifierIndex(object):
+    """
+    Maps identifiers to the files that contain them, so files that don't
+    contain a name don't have to be opened again. The index is split by
+    directories and saved in the cache directory when Python exits or when a
+    directory is removed from memory. Only the recently used directories are
+    kept in memory.
+    """
+    def __init__(self):
+        # OrderedDict[str, Tuple[Dict[str, float], Dict[str, Set[str]]]], maps
+        # directories to the modification times of their files and to the
+        # files that contain an identifier.
+        self._directories = OrderedDict()
+        self._changed_directories = set()
+
+    def _get_directory(self, directory):
+        try:
+            # Reinsert the directory, it's the most recently used one now.
+            self._directories[directory] = index = self._directories.pop(directory)
+            return index
+        except KeyError:
+            pass
+        index = load_from_disk_cache('identifier_index', directory) or ({}, {})
+        self._directories[directory] = index
+        while len(self._directories) > _IDENTIFIER_INDEX_DIRECTORY_LIMIT:
+            old_directory, old_index = self._directories.popitem(last=False)
+            if old_directory in self._changed_directories:
+                self._changed_directories.remove(old_directory)
+                save_to_disk_cache('identifier_index', old_directory, old_index)
+        return index
+
+    def contains(self, file_io, identifier):
+        """
+        Returns if a file contains an identifier or None if the file is not
+        known.
+        """
+        if isinstance(file_io, KnownContentFileIO):
+            # The content might not be the same as on disk.
+            return None
+        directory, file_name = os.path.split(file_io.path)
+        modification_times, identifiers = self._get_directory(directory)
+        try:
+            last_modified = modification_times[file_name]
+        except KeyError:
+            return None
+        if last_modified != file_io.get_last_modified():
+            return None
+        return file_name in identifiers.get(identifier, ())
+
+    def set(self, file_io, last_modified, code):
+        if isinstance(file_io, KnownContentFileIO) or last_modified is None:
+            return
+        directory, file_name = os.path.split(file_io.path)
+        modification_times, identifiers = self._get_directory(directory)
+        if file_name in modification_times:
+            # The file changed, remove its old identifiers.
+            for identifier, file_names in list(identifiers.items()):
+                file_names.discard(file_name)
+                if not file_names:
+                    del identifiers[identifier]
+        modification_times[file_name] = last_modified
+        for identifier in set(_IDENTIFIER_REGEX.findall(code)):
+            identifiers.setdefault(identifier, set()).add(file_name)
+        self._changed_directories.add(directory)
+
+    def save(self):
+        while self._changed_directories:
+            directory = self._changed_directories.pop()
+            save_to_disk_cache('identifier_index', directory, self._directories[directory])
+
+
+_identifier_index = _IdentifierIndex()
+atexit.register(_identifier_index.save)
+
 
 def _resolve_names(definition_names, avoid_names=()):
     for name in definition_names:
@@ -142,6 +242,7 @@ def find_references(module_context, tree_name):
     non_matching_reference_maps = {}
     for module_context in potential_modules:
         for name_leaf in module_context.tree_node.get_used_names().get(search_name, []):
+            inf.check_cancelled()
             new = _dictionarize(_find_names(module_context, name_leaf))
             if any(tree_name in found_names_dct for tree_name in new):
                 found_names_dct.update(new)
@@ -160,14 +261,69 @@ def find_references(module_context, tree_name):
     return found_names_dct.values()
 
 
-def _check_fs(inference_state, file_io, regex):
+def _read_file(file_io, regex):
+    """
+    Returns the modification time and the code of a file and if the code
+    matches the regex. This is also called in threads, so it must not use any
+    shared state.
+    """
+    last_modified = file_io.get_last_modified()
     try:
         code = file_io.read()
     except FileNotFoundError:
         return None
     code = python_bytes_to_unicode(code, errors='replace')
-    if not regex.search(code):
-        return None
+    return last_modified, code, regex.search(code) is not None
+
+
+def _get_file_reader_executor():
+    """
+    The threads are shared by all searches and only started once they are
+    needed.
+    """
+    global _file_reader_executor
+    if _file_reader_executor is None:
+        _file_reader_executor = ThreadPoolExecutor(_FILE_READER_THREADS)
+    return _file_reader_executor
+
+
+def _iter_read_files(file_ios, regex, skip):
+    """
+    Reads the files in threads, but yields them in their original order. Files
+    for which ``skip`` returns True are not read, their result is
+    ``_SKIPPED``. They are still yielded, so the caller can count them.
+    """
+    if ThreadPoolExecutor is None or _FILE_READER_THREADS <= 1:
+        for file_io in file_ios:
+            yield file_io, _SKIPPED if skip(file_io) else _read_file(file_io, regex)
+        return
+
+    executor = _get_file_reader_executor()
+    pending = deque()
+
+    def pop():
+        file_io, future = pending.popleft()
+        return file_io, _SKIPPED if future is None else future.result()
+
+    try:
+        for file_io in file_ios:
+            if skip(file_io):
+                future = None
+            else:
+                future = executor.submit(_read_file, file_io, regex)
+            pending.append((file_io, future))
+            # Don't walk too far ahead, the caller might stop early.
+            if len(pending) >= 2 * _FILE_READER_THREADS:
+                yield pop()
+        while pending:
+            yield pop()
+    finally:
+        for file_io, future in pending:
+            if future is not None:
+                future.cancel()
+
+
+def _load_module_context(inference_state, file_io, code):
     new_file_io = KnownContentFileIO(file_io.path, code)
     m = load_module_from_path(inference_state, new_file_io)
     if m.is_compiled():
@@ -276,16 +432,37 @@ def search_in_file_ios(inference_state, file_io_iterator, name, limit_reduction=
     file_io_count = 0
     parsed_file_count = 0
     regex = re.compile(r'\b' + re.escape(name) + r'\b')
-    for file_io in file_io_iterator:
-        file_io_count += 1
-        m = _check_fs(inference_state, file_io, regex)
-        if m is not None:
-            parsed_file_count += 1
-            yield m
-            if parsed_file_count >= parse_limit:
-                dbg('Hit limit of parsed files: %s', parse_limit)
-                break
+    use_index = _IDENTIFIER_REGEX.findall(name) == [name]
 
-        if file_io_count >= open_limit:
-            dbg('Hit limit of opened files: %s', open_limit)
-            break
+    def skip(file_io):
+        inference_state.check_cancelled()
+        # Files that are known to not contain the name are not opened.
+        return use_index and _identifier_index.contains(file_io, name) is False
+
+    # Reading the files happens in threads, parsing and inferring is done
+    # here, because it's not thread-safe.
+    read_files = _iter_read_files(file_io_iterator, regex, skip)
+    try:
+        for file_io, result in read_files:
+            inference_state.check_cancelled()
+            if result is _SKIPPED:
+                # Skipped files only cost a stat and don't count towards the
+                # limit of opened files.
+                continue
+            file_io_count += 1
+            if result is not None:
+                last_modified, code, matches = result
+                _identifier_index.set(file_io, last_modified, code)
+                m = _load_module_context(inference_state, file_io, code) if matches else None
+                if m is not None:
+                    parsed_file_count += 1
+                    yield m
+                    if parsed_file_count >= parse_limit:
+                        dbg('Hit limit of parsed files: %s', parse_limit)
+                        break
+
+            if file_io_count >= open_limit:
+                dbg('Hit limit of opened files: %s', open_limit)
+                break
+    finally:
+        read_files.close()
@@ -44,6 +44,9 @@ def _limit_value_infers(func):
     def wrapper(context, *args, **kwargs):
         n = context.tree_node
         inference_state = context.inference_state
+        inference_state.check_cancelled()
+        if inference_state.is_past_deadline():
+            return NO_VALUES
         try:
             inference_state.inferred_element_counts[n] += 1
             maximum = 300
@@ -44,6 +44,17 @@ Caching
 ~~~~~~~
 
 .. autodata:: call_signatures_validity
+.. autodata:: memoize_cache_size
+
+
+Compiled subprocesses
+~~~~~~~~~~~~~~~~~~~~~
+
+.. autodata:: compiled_subprocess_pool_size
+.. autodata:: compiled_subprocess_preloaded_modules
+.. autodata:: save_extension_results
+.. autodata:: generate_extension_stubs
+.. autodata:: same_environment_in_process
 
 
 """
@@ -149,3 +160,62 @@ call_signatures_validity = 3.0
 Finding function calls might be slow (0.1-0.5s). This is not acceptible for
 normal writing. Therefore cache it for a short time.
 """
+
+memoize_cache_size = None
+"""
+The maximum number of inferred results that are kept per memoized function of
+an inference state. ``None`` means that there is no limit. Setting this keeps
+the memory of long running processes that use a :class:`.Session` in check.
+The least recently used results are removed first.
+
+Small limits make inference slower and might even lead to worse results,
+because results have to be inferred again and recursion limits are reached
+earlier. A few thousand entries is a reasonable start.
+"""
+
+# ----------------
+# Compiled subprocesses
+# ----------------
+
+compiled_subprocess_pool_size = 1
+"""
+The number of subprocesses per environment that are used to inspect compiled
+modules. Every new script uses the subprocess with the fewest scripts that are
+still alive, so servers that work on a lot of scripts at once don't have to
+wait for a single subprocess. Crashed subprocesses are replaced.
+"""
+
+compiled_subprocess_preloaded_modules = []
+"""
+Modules that are imported as soon as a subprocess starts, e.g.
+``['numpy', 'os']``. This makes the first completions for big libraries
+faster.
+"""
+
+save_extension_results = False
+"""
+If enabled, the results of inspecting C extensions are saved in the cache
+directory, so other processes don't need to import the extensions again. The
+results are used until the files of the extension or the directories of the
+sys path change. Modules that the extension imports are not checked, so the
+results might be outdated.
+"""
+
+generate_extension_stubs = False
+"""
+If enabled, C extensions are not inspected by importing them in a subprocess.
+Instead they are imported once to generate a stub with their names,
+signatures and docstrings, which is saved in the cache directory. Afterwards
+the stub is used until the files of the extension change. This avoids slow
+imports and imports with side effects, but values are only known as far as
+the stub describes them.
+"""
+
+same_environment_in_process = False
+"""
+If enabled, environments that use the running Python interpreter inspect
+compiled modules in this process instead of a subprocess, which avoids the
+overhead of talking to the subprocess. Modules that are imported for this are
+removed from ``sys.modules`` again. However imports still execute code in
+this process and a crashing C extension crashes it as well.
+"""
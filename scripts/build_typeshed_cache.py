@@ -0,0 +1,44 @@
+#! /usr/bin/env python
+"""
+Fills Jedi's cache directory with the index of typeshed and the parsed stubs
+of the most used modules. This can be run as a build step (e.g. when creating
+a Docker image for an editor), so the first completion of every new process
+doesn't have to pay for it.
+
+Usage:
+  build_typeshed_cache.py [<module>...] [-e <executable>]
+  build_typeshed_cache.py -h | --help
+
+Options:
+  -h --help         Show this screen.
+  -e <executable>   The Python executable the cache is built for. Defaults
+                    to the one running this script.
+"""
+import os
+import sys
+import time
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__) + '/..'))
+
+from docopt import docopt
+
+import jedi
+
+DEFAULT_MODULES = ['builtins', 'typing', 'os', 'sys', 're', 'collections']
+
+
+def main(args):
+    environment = None
+    if args['-e']:
+        environment = jedi.create_environment(args['-e'])
+    modules = args['<module>'] or DEFAULT_MODULES
+
+    t0 = time.time()
+    for module in modules:
+        code = 'import %s as x; x.' % module
+        jedi.Script(code, environment=environment).complete()
+    print('Cached the stubs of %s modules in %s (%.2fs)'
+          % (len(modules), jedi.settings.cache_directory, time.time() - t0))
+
+
+if __name__ == '__main__':
+    main(docopt(__doc__))
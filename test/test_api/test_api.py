@@ -11,7 +11,7 @@ from pytest import raises
 from parso import cache
 
 from jedi._compatibility import unicode
-from jedi import preload_module
+from jedi import preload_module, CancellationToken, CancelledError
 from jedi.inference.gradual import typeshed
 from test.helpers import test_dir, get_example_dir
 
@@ -322,15 +322,17 @@ def test_docstrings_for_completions(Script):
 
 def test_fuzzy_completion(Script):
     script = Script('string =  "hello"\nstring.upper')
-    assert ['isupper',
-            'upper'] == [comp.name for comp in script.complete(fuzzy=True)]
+    # Names that start with the string are ranked first.
+    assert ['upper',
+            'isupper'] == [comp.name for comp in script.complete(fuzzy=True)]
 
 
 def test_math_fuzzy_completion(Script, environment):
     script = Script('import math\nmath.og')
-    expected = ['copysign', 'log', 'log10', 'log1p']
+    expected = ['log', 'log10', 'log1p']
     if environment.version_info.major >= 3:
         expected.append('log2')
+    expected.append('copysign')
     completions = script.complete(fuzzy=True)
     assert expected == [comp.name for comp in completions]
     for c in completions:
@@ -366,3 +368,100 @@ def test_multi_goto(Script):
     y, = script.goto(line=4)
     assert x.line == 1
     assert y.line == 2
+
+
+def test_infer_many_and_goto_many(Script):
+    code = 'x = 1\ny = 1.0\nx\ny'
+    script = Script(code)
+    positions = [(3, 0), (4, 0), (3, 1), (1, 0)]
+    infer = script.infer_many(positions)
+    assert [[d.name for d in defs] for defs in infer] == [['int'], ['float'], ['int'], ['int']]
+
+    goto = script.goto_many(positions)
+    assert [[d.line for d in defs] for defs in goto] == [[1], [2], [1], [1]]
+    assert goto[0] == script.goto(3, 0)
+
+    with pytest.raises(ValueError):
+        script.infer_many([(5, 0)])
+
+
+def test_get_signatures_many(Script, monkeypatch):
+    from jedi.api import helpers
+
+    inferred = []
+    cache_signatures = helpers.cache_signatures
+
+    def cache_signatures_recorded(inference_state, context, bracket_leaf, *args):
+        inferred.append(bracket_leaf)
+        return cache_signatures(inference_state, context, bracket_leaf, *args)
+
+    monkeypatch.setattr(helpers, 'cache_signatures', cache_signatures_recorded)
+    script = Script('abs(1)\ndivmod(1, 2)\n')
+    signatures = script.get_signatures_many([(1, 4), (2, 7), (2, 10), (1, 0)])
+    assert [[s.name for s in found] for found in signatures] \
+        == [['abs'], ['divmod'], ['divmod'], []]
+    assert [found[0].index for found in signatures[:3]] == [0, 0, 1]
+    # The call of divmod is only inferred once.
+    assert len(inferred) == 2
+
+    with pytest.raises(ValueError):
+        script.get_signatures_many([(3, 1)])
+
+
+def test_timeout(Script):
+    code = 'def f():\n    return 1\nf().real\nabs(f(), '
+    script = Script(code)
+    assert script.complete(3, 4, timeout=0) == []
+    assert script.incomplete
+    assert script.infer(3, 5, timeout=0) == []
+    assert script.incomplete
+    # Calls without a timeout are always complete.
+    assert script.goto(3, 0)
+    assert not script.incomplete
+    assert script.infer(3, 5, timeout=0) == []
+    assert script.incomplete
+
+    # Results that were cut short are not reused.
+    assert 'real' in [c.name for c in script.complete(3, 4, timeout=10)]
+    assert not script.incomplete
+    assert [d.name for d in script.infer(3, 5)] == ['int']
+    assert [s.name for s in script.get_signatures(4, 9, timeout=10)] == ['abs']
+
+
+def test_cancellation_token(Script):
+    code = 'def f():\n    return 1\nf().real\nabs(f(), '
+    script = Script(code)
+    token = CancellationToken()
+    token.cancel()
+    with pytest.raises(CancelledError):
+        script.complete(3, 4, cancellation_token=token)
+    with pytest.raises(CancelledError):
+        script.infer(3, 5, cancellation_token=token)
+    with pytest.raises(CancelledError):
+        script.goto(3, 5, follow_imports=True, cancellation_token=token)
+    with pytest.raises(CancelledError):
+        script.get_signatures(4, 9, cancellation_token=token)
+
+    # Jedi still works after cancelling.
+    token = CancellationToken()
+    assert 'real' in [c.name for c in script.complete(3, 4, cancellation_token=token)]
+    assert [d.name for d in script.infer(3, 5)] == ['int']
+    assert [s.name for s in script.get_signatures(4, 9)] == ['abs']
+
+
+def test_cancel_references(Script):
+    class Token(object):
+        """Is cancelled while the references are searched."""
+        checks = 0
+
+        @property
+        def cancelled(self):
+            self.checks += 1
+            return self.checks > 1
+
+    script = Script('def foo():\n    return 1\nx = foo().real\nfoo')
+    token = Token()
+    with pytest.raises(CancelledError):
+        script.get_references(4, 1, cancellation_token=token)
+    assert token.checks == 2
+    assert len(script.get_references(4, 1)) == 3
@@ -6,7 +6,7 @@ from textwrap import dedent
 import pytest
 
 from ..helpers import root_dir
-from jedi.api.helpers import _start_match, _fuzzy_match
+from jedi.api.helpers import _start_match, _fuzzy_match, fuzzy_score
 from jedi._compatibility import scandir
 
 
@@ -417,6 +417,29 @@ def test_fuzzy_match():
     assert _fuzzy_match('Condition', 'Cdiio')
 
 
+def test_fuzzy_score():
+    assert fuzzy_score('Condition', 'p') is None
+    assert fuzzy_score('Condition', 'Con') < fuzzy_score('Condition', 'on')
+    assert fuzzy_score('Condition', 'on') < fuzzy_score('Condition', 'Cn')
+    assert fuzzy_score('Condition', 'di') < fuzzy_score('Condition', 'dn')
+
+
+def test_completion_limit(Script):
+    script = Script('import os\nos.')
+    completions = script.complete()
+    limited = script.complete(limit=5)
+    assert [c.name for c in limited] == [c.name for c in completions[:5]]
+    assert [c.name for c in script.complete(limit=5, fuzzy=True)] \
+        == [c.name for c in script.complete(fuzzy=True)[:5]]
+    assert script.complete(limit=0) == []
+
+    completions = Script('import os\nos.pa').complete()
+    assert [c.name for c in Script('import os\nos.pa').complete(limit=2)] \
+        == [c.name for c in completions[:2]]
+    assert [c.name for c in Script('import os\nos.pa').complete(limit=1000)] \
+        == [c.name for c in completions]
+
+
 def test_ellipsis_completion(Script):
     assert Script('...').complete() == []
 
@@ -451,6 +474,30 @@ def test_completion_cache(Script, module_injector):
     assert cls.docstring() == 'foo()\n\ndoc2'
 
 
+def test_resolve_completions(Script, monkeypatch):
+    from jedi import resolve_types, resolve_docstrings
+    from jedi.api import completion_cache
+
+    monkeypatch.setattr(completion_cache, '_cache', {})
+    monkeypatch.setattr(completion_cache, '_disk_keys', {})
+    monkeypatch.setattr(completion_cache, '_unsaved', set())
+    completions = Script('import json; json.').complete()
+    types = resolve_types(completions)
+    assert dict(zip([c.name for c in completions], types))['loads'] == 'function'
+    assert types == [c.type for c in completions]
+    # Library modules are cached, even if they are not compiled.
+    key = completions[0]._cached_name
+    assert key[0] == 'json'
+    assert completion_cache.has_entry(key, 'loads')
+    assert not completion_cache.has_entry(key, 'loads', 2)
+
+    docstrings = resolve_docstrings(completions)
+    assert docstrings == [c.docstring() for c in completions]
+    assert completion_cache.has_entry(key, 'loads', 2)
+    new_completions = Script('import json; json.').complete()
+    assert resolve_docstrings(new_completions) == docstrings
+
+
 @pytest.mark.parametrize('module', ['typing', 'os'])
 def test_module_completions(Script, module):
     for c in Script('import {module}; {module}.'.format(module=module)).complete():
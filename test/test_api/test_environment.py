@@ -1,5 +1,7 @@
 import os
 import sys
+import gc
+import time
 
 import pytest
 
@@ -8,7 +10,7 @@ from jedi._compatibility import py_version
 from jedi.api.environment import get_default_environment, find_virtualenvs, \
     InvalidPythonEnvironment, find_system_environments, \
     get_system_environment, create_environment, InterpreterEnvironment, \
-    get_cached_default_environment
+    get_cached_default_environment, SameEnvironment
 
 
 def test_sys_path():
@@ -90,6 +92,159 @@ def test_killed_subprocess(inference_state, Script, environment):
     assert def_.name == 'str'
 
 
+def test_subprocess_pool(environment, monkeypatch):
+    if isinstance(environment, InterpreterEnvironment):
+        pytest.skip("There are no subprocesses")
+    monkeypatch.setattr(jedi.settings, 'compiled_subprocess_pool_size', 2)
+    monkeypatch.setattr(jedi.settings, 'compiled_subprocess_preloaded_modules', ['json'])
+    environment = create_environment(environment.executable, safe=False)
+
+    def get_subprocess(script):
+        return script._inference_state.compiled_subprocess._compiled_subprocess
+
+    script1 = jedi.Script('import json; json.lo', environment=environment)
+    script2 = jedi.Script('import json; json.lo', environment=environment)
+    subprocess1 = get_subprocess(script1)
+    subprocess2 = get_subprocess(script2)
+    assert subprocess1 is not subprocess2
+    assert len(script2.complete()) == 2
+
+    subprocess2._kill()
+    script3 = jedi.Script('import json; json.lo', environment=environment)
+    assert get_subprocess(script3) not in (subprocess1, subprocess2)
+    assert len(script3.complete()) == 2
+
+
+def test_subprocess_starts_in_background(environment, monkeypatch):
+    if isinstance(environment, InterpreterEnvironment):
+        pytest.skip("There are no subprocesses")
+    monkeypatch.setattr(jedi.settings, 'compiled_subprocess_pool_size', 2)
+    # The information about the environment is cached now.
+    create_environment(environment.executable, safe=False)
+
+    environment = create_environment(environment.executable, safe=False)
+    environment._start_thread.join()
+    assert environment._subprocess is not None
+    assert len(environment._subprocess_pool) == 1
+
+    session = jedi.Session(environment=environment)
+    script = session.Script('import json; json.lo')
+    subprocess = script._inference_state.compiled_subprocess._compiled_subprocess
+    assert subprocess in [environment._subprocess] + environment._subprocess_pool
+
+
+def test_delete_in_background_survives_errors():
+    from threading import Event, Thread
+    from jedi.inference.compiled import subprocess
+
+    class FakeSubprocess(object):
+        is_crashed = False
+        calls = 0
+
+        def flush_deletions(self):
+            self.calls += 1
+            if self.calls == 1:
+                raise RuntimeError("Set changed size during iteration")
+            self.is_crashed = True
+
+    fake = FakeSubprocess()
+    event = Event()
+    thread = Thread(target=subprocess._delete_in_background,
+                    args=(lambda: fake, event))
+    thread.daemon = True
+    thread.start()
+    for _ in range(3):
+        event.set()
+        thread.join(1)
+    assert not thread.is_alive()
+    assert fake.calls == 2
+
+
+def test_delete_in_subprocess(environment):
+    if isinstance(environment, InterpreterEnvironment):
+        pytest.skip("There are no subprocesses")
+    environment = create_environment(environment.executable, safe=False)
+    script = jedi.Script('', environment=environment)
+    compiled_subprocess = script._inference_state.compiled_subprocess
+    count = compiled_subprocess._test_get_access_handle_count()
+
+    access_path = compiled_subprocess.create_simple_object(1.5)
+    assert compiled_subprocess._test_get_access_handle_count() > count
+    del access_path
+    assert compiled_subprocess._test_get_access_handle_count() == count
+
+    # Inference states are deleted in the background without using the
+    # subprocess again.
+    subprocess = compiled_subprocess._compiled_subprocess
+    del script, compiled_subprocess
+    gc.collect()
+    for _ in range(100):
+        if not subprocess._inference_state_deletion_queue:
+            break
+        time.sleep(0.05)
+    assert not subprocess._inference_state_deletion_queue
+
+
+def test_same_environment_in_process(monkeypatch):
+    from jedi.inference.compiled.subprocess import InferenceStateSameProcess
+    monkeypatch.setattr(jedi.settings, 'same_environment_in_process', True)
+    monkeypatch.delitem(sys.modules, '_csv', raising=False)
+    path = list(sys.path)
+
+    script = jedi.Script('import _csv; _csv.rea', environment=SameEnvironment())
+    assert isinstance(script._inference_state.compiled_subprocess, InferenceStateSameProcess)
+    assert [c.name for c in script.complete()] == ['reader']
+    # Imports of Jedi don't leak into this process.
+    assert '_csv' not in sys.modules
+    assert sys.path == path
+
+
+def test_same_environment_in_process_keeps_program_modules(monkeypatch):
+    from types import ModuleType
+    monkeypatch.setattr(jedi.settings, 'same_environment_in_process', True)
+    monkeypatch.setitem(sys.modules, 'jedi_test_old', ModuleType('jedi_test_old'))
+    script = jedi.Script('', environment=SameEnvironment())
+    process = script._inference_state.compiled_subprocess
+    with process._sandbox():
+        pass
+
+    # The program imports a module and removes another one, so the number of
+    # modules stays the same.
+    monkeypatch.delitem(sys.modules, 'jedi_test_old')
+    monkeypatch.setitem(sys.modules, 'jedi_test_new', ModuleType('jedi_test_new'))
+    with process._sandbox():
+        sys.modules['jedi_test_inner'] = ModuleType('jedi_test_inner')
+    assert 'jedi_test_new' in sys.modules
+    assert 'jedi_test_inner' not in sys.modules
+
+
+def test_environment_info_cache(environment, tmpdir, monkeypatch):
+    if isinstance(environment, InterpreterEnvironment):
+        pytest.skip("There are no subprocesses")
+    from jedi.api import environment as environment_module
+    monkeypatch.setattr(jedi.settings, 'cache_directory', tmpdir.strpath)
+    executable = environment.executable
+
+    first = create_environment(executable, safe=False)
+    assert first._subprocess is not None
+
+    def calculate_sha256_for_file(path):
+        raise AssertionError("The hash should be cached")
+
+    monkeypatch.setattr(environment_module, '_calculate_sha256_for_file',
+                        calculate_sha256_for_file)
+    second = create_environment(executable, safe=False)
+    # The subprocess is only started once it's needed.
+    assert second._subprocess is None
+    assert second.executable == first.executable
+    assert second.path == first.path
+    assert second.version_info == first.version_info
+    assert second._sha256 == first._sha256
+    # The sys path is shared with the first environment.
+    assert second.get_sys_path() == first.get_sys_path()
+    assert second._subprocess is None
+
+
 def test_not_existing_virtualenv(monkeypatch):
     """Should not match the path that was given"""
     path = '/foo/bar/jedi_baz'
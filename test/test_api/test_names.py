@@ -2,10 +2,16 @@
 Tests for `api.names`.
 """
 
+import os
+import sys
+import json
+import subprocess
 from textwrap import dedent
 
 import pytest
 
+import jedi
+
 
 def _assert_definition_names(definitions, names):
     assert [d.name for d in definitions] == names
@@ -189,3 +195,71 @@ def test_no_error(get_names):
 def test_is_side_effect(get_names, code, index, is_side_effect):
     names = get_names(code, references=True, all_scopes=True)
     assert names[index].is_side_effect() == is_side_effect
+
+
+def test_iter_inferred_names(Script):
+    code = 'def foo(a=1):\n    return a\nx = foo()\n'
+    result = [
+        (name.name, name.line, [d.line for d in definitions], [i.name for i in inferred])
+        for name, definitions, inferred in Script(code).iter_inferred_names()
+    ]
+    assert result == [
+        ('foo', 1, [1], ['foo']),
+        ('a', 1, [1], ['int']),
+        ('a', 2, [1], ['int']),
+        ('x', 3, [3], ['int']),
+        ('foo', 3, [1], ['foo']),
+    ]
+
+    names = Script(code).iter_inferred_names(all_scopes=False, references=False)
+    assert [name.name for name, _, _ in names] == ['foo', 'x']
+
+
+@pytest.mark.parametrize(
+    'code', [
+        'import json\nclass X:\n    def f(self, a):\n        return json.loads(a)\n',
+        'import os\nos.path.join("a").upper().lower\nx = os.path\nx.sep = 3\n',
+        'class A:\n    b = 1\n    def f(self):\n        self.c = A\n        self.c.b.real\n',
+        'async def f(x):\n    await x.foo\n    ((x).y).z\n    x[0].a.b\n',
+    ]
+)
+def test_iter_inferred_names_like_script(Script, code):
+    script = Script(code)
+    for name, definitions, inferred in script.iter_inferred_names():
+        position = name.line, name.column
+        assert set(definitions) == set(script.goto(*position))
+        assert inferred == script.infer(*position)
+
+
+def test_iter_inferred_names_attributes(Script, monkeypatch):
+    from jedi.inference import helpers
+
+    leaves = []
+    infer_call_of_leaf = helpers.infer_call_of_leaf
+
+    def infer_call_of_leaf_recorded(context, leaf, *args, **kwargs):
+        leaves.append(leaf.value)
+        return infer_call_of_leaf(context, leaf, *args, **kwargs)
+
+    monkeypatch.setattr(helpers, 'infer_call_of_leaf', infer_call_of_leaf_recorded)
+    code = 'import os\nos.path.sep.upper\n'
+    names = Script(code).iter_inferred_names(definitions=False)
+    assert [[i.name for i in inferred] for _, _, inferred in names] \
+        == [['os'], ['ntpath', 'posixpath'], ['str'], ['upper']]
+    # The attributes are looked up in the values of the names before them.
+    assert leaves == ['os']
+
+
+def test_names_command(tmpdir):
+    tmpdir.join('mod.py').write('def foo():\n    return 1\nx = foo()\n')
+    output = subprocess.check_output(
+        [sys.executable, '-m', 'jedi', 'names', tmpdir.strpath],
+        cwd=os.path.dirname(os.path.dirname(jedi.__file__)),
+    )
+    lines = [json.loads(line) for line in output.decode('utf-8').splitlines()]
+    assert [(d['name'], d['line'], d['is_definition']) for d in lines] == [
+        ('foo', 1, True), ('x', 3, True), ('foo', 3, False)
+    ]
+    assert lines[1]['inferred'][0]['name'] == 'int'
+    assert lines[2]['definitions'][0]['line'] == 1
+    assert lines[2]['signatures'] == ['foo()']
@@ -1,10 +1,11 @@
 import os
 import sys
+import time
 
 import pytest
 
 from ..helpers import get_example_dir, set_cwd, root_dir, test_dir
-from jedi import Interpreter
+from jedi import Interpreter, settings
 from jedi.api import Project, get_default_project
 
 
@@ -151,3 +152,53 @@ def test_complete_search(Script, string, completions, all_scopes, skip_pre_pytho
     project = Project(test_dir)
     defs = project.complete_search(string, all_scopes=all_scopes)
     assert [d.complete for d in defs] == completions
+
+
+@pytest.mark.skipif(sys.version_info < (3, 6), reason="Ignore Python 2, because EOL")
+def test_symbol_index(tmpdir, monkeypatch, skip_pre_python36):
+    from jedi.api import project as project_module
+
+    monkeypatch.setattr(settings, 'cache_directory', tmpdir.join('cache').strpath)
+    monkeypatch.setattr(project_module, '_symbol_indexes', {})
+    tmpdir.join('first.py').write('def some_function(): pass\n')
+    tmpdir.join('second.py').write('class SomeClass:\n    def some_method(self): pass\n')
+    project = Project(tmpdir.strpath, search_index=True)
+
+    def search(string, **kwargs):
+        return [d.full_name for d in project.search(string, **kwargs)]
+
+    assert search('some_function') == ['first.some_function']
+    assert search('some_method') == []
+    assert search('some_method', all_scopes=True) == ['second.SomeClass.some_method']
+    completions = [c.name for c in project.complete_search('some_')]
+    assert completions == ['some_function']
+    assert search('class SomeClass') == ['second.SomeClass']
+    assert search('def SomeClass') == []
+    assert search('SomeClass.some_method') == ['second.SomeClass.some_method']
+
+    index = project_module._symbol_indexes[tmpdir.strpath]
+    _, definitions = index._files[tmpdir.join('second.py').strpath]
+    assert ('some_method', 'SomeClass.some_method', 'function', (2, 8), False) \
+        in definitions
+
+    # Unchanged files are not parsed again.
+    parsed = []
+    get_definitions = project_module._SymbolIndex._get_definitions
+    monkeypatch.setattr(
+        project_module._SymbolIndex, '_get_definitions',
+        lambda self, i, file_io: parsed.append(file_io.path) or get_definitions(self, i, file_io)
+    )
+    path = tmpdir.join('first.py')
+    path.write('def other_function(): pass\n')
+    # Make sure that the modification is noticed.
+    future = time.time() + 100
+    os.utime(path.strpath, (future, future))
+    assert search('some_function') == []
+    assert search('other_function') == ['first.other_function']
+    assert parsed == [path.strpath]
+
+    # Other projects with the same path use the index in memory.
+    monkeypatch.setattr(project_module, 'load_from_disk_cache', None)
+    project = Project(tmpdir.strpath, search_index=True)
+    assert search('other_function') == ['first.other_function']
+    assert parsed == [path.strpath]
@@ -0,0 +1,198 @@
+import os
+
+import pytest
+
+from jedi import Project, Session, settings
+from jedi.file_io import FileIO
+from jedi.inference.imports import _load_python_module
+from jedi.inference.base_value import ValueSet
+
+
+def _write(path, code, mtime):
+    with open(path, 'w') as f:
+        f.write(code)
+    # Make sure the modification is noticed, even on file systems with a
+    # coarse timestamp resolution.
+    os.utime(path, (mtime, mtime))
+
+
+def test_session_reuses_inference_state(environment):
+    session = Session(environment=environment)
+    script1 = session.Script('import json; json.lo')
+    state = script1._inference_state
+    builtins = state.builtins_module
+
+    script2 = session.Script('import json; json.lo')
+    assert script2._inference_state is state
+    assert script2._inference_state.builtins_module is builtins
+    assert [c.name for c in script2.complete()] == ['load', 'loads']
+
+
+def test_session_invalidates_changed_modules(tmpdir, environment):
+    path = os.path.join(tmpdir.strpath, 'session_mod.py')
+    _write(path, 'def foo(): pass\n', 1000)
+
+    session = Session(Project(tmpdir.strpath), environment=environment)
+    code = 'import session_mod; session_mod.'
+    assert 'foo' in [c.name for c in session.Script(code).complete()]
+
+    _write(path, 'def bar(): pass\n', 2000)
+    names = [c.name for c in session.Script(code).complete()]
+    assert 'bar' in names
+    assert 'foo' not in names
+
+
+def test_module_cache_remove_changed(tmpdir, inference_state):
+    path = os.path.join(tmpdir.strpath, 'cached_mod.py')
+    _write(path, 'x = 1\n', 1000)
+    module = _load_python_module(inference_state, FileIO(path), ('cached_mod',))
+    module_cache = inference_state.module_cache
+    module_cache.add(('cached_mod',), ValueSet([module]))
+
+    assert module_cache.remove_changed() == []
+    assert module_cache.get(('cached_mod',))
+
+    _write(path, 'x = 2\n', 2000)
+    assert module_cache.remove_changed() == [module]
+    assert module_cache.get(('cached_mod',)) is None
+
+
+def test_session_invalidates_dependent_results(tmpdir, environment):
+    _write(os.path.join(tmpdir.strpath, 'dep_a.py'), 'import dep_b\nx = dep_b.foo()\n', 1000)
+    _write(os.path.join(tmpdir.strpath, 'dep_b.py'), 'def foo(): return 1\n', 1000)
+    _write(os.path.join(tmpdir.strpath, 'dep_c.py'), 'def bar(): return ""\n', 1000)
+
+    session = Session(Project(tmpdir.strpath), environment=environment)
+
+    def infer(code):
+        return [d.name for d in session.Script(code).infer()]
+
+    assert infer('import dep_c; dep_c.bar()') == ['str']
+    assert infer('import dep_a; dep_a.x') == ['int']
+    state = session._inference_state
+    module_c, = state.module_cache.get(('dep_c',))
+    memo_entries = state.memoize_cache._dependents[module_c]
+    assert memo_entries
+
+    _write(os.path.join(tmpdir.strpath, 'dep_b.py'), 'def foo(): return ""\n', 2000)
+    assert infer('import dep_a; dep_a.x') == ['str']
+    # Results of modules that did not change are kept.
+    assert state.memoize_cache._dependents[module_c] == memo_entries
+
+
+def test_dependencies_only_tracked_in_sessions(Script):
+    script = Script('import json; json.loads')
+    assert script.infer()
+    memoize_cache = script._inference_state.memoize_cache
+    assert not memoize_cache.track_dependencies
+    assert not memoize_cache._dependents
+
+
+def test_session_cache_statistics(environment):
+    session = Session(environment=environment)
+    assert 'jedi.inference.imports.infer_import' not in session.get_cache_statistics()
+    session.Script('import json; json.lo').complete()
+    session.Script('import json; json.lo').complete()
+
+    statistics = session.get_cache_statistics()
+    star_imports = statistics['jedi.inference.value.module.ModuleMixin.star_imports']
+    assert star_imports.hits > 0
+    assert star_imports.misses > 0
+    assert star_imports.evictions == 0
+    assert star_imports.size > 0
+
+    method_statistics = statistics['jedi.api.Script._get_module']
+    assert method_statistics.size is None
+
+
+def test_session_memoize_cache_size(environment, monkeypatch):
+    monkeypatch.setattr(settings, 'memoize_cache_size', 3)
+    session = Session(environment=environment)
+    code = 'import os; os.path.join("a", "b").upp'
+    assert [c.name for c in session.Script(code).complete()] == ['upper']
+    assert [c.name for c in session.Script(code).complete()] == ['upper']
+
+    statistics = session.get_cache_statistics().values()
+    assert all(s.size <= 3 for s in statistics if s.size is not None)
+    assert sum(s.evictions for s in statistics) > 0
+
+
+def test_session_reuses_trailer_completions(tmpdir, environment, monkeypatch):
+    from jedi.api.completion import Completion
+    complete_trailer = Completion._complete_trailer
+    calls = []
+
+    def complete_trailer_counted(self, previous_leaf):
+        calls.append(previous_leaf.value)
+        return complete_trailer(self, previous_leaf)
+
+    monkeypatch.setattr(Completion, '_complete_trailer', complete_trailer_counted)
+    session = Session(environment=environment)
+    assert [c.name for c in session.Script('import json\njson.lo').complete()] \
+        == ['load', 'loads']
+    assert [c.name for c in session.Script('import json\njson.loa').complete()] \
+        == ['load', 'loads']
+    assert calls == ['json']
+
+    # Other names are filtered from the same names.
+    assert [c.name for c in session.Script('import json\njson.du').complete()] \
+        == ['dump', 'dumps']
+    assert calls == ['json']
+
+    # Other code before the name needs a new completion.
+    assert [c.name for c in session.Script('import json as j\nj.du').complete()] \
+        == ['dump', 'dumps']
+    assert calls == ['json', 'j']
+
+    # A changed module might have other names.
+    path = os.path.join(tmpdir.strpath, 'session_trailer.py')
+    _write(path, 'foo = 1\n', 1000)
+    code = 'import session_trailer\nsession_trailer.f'
+    session = Session(Project(tmpdir.strpath), environment=environment)
+    assert [c.name for c in session.Script(code).complete()] == ['foo']
+    _write(path, 'foo = 1\nfoobar = 2\n', 2000)
+    assert [c.name for c in session.Script(code + 'o').complete()] == ['foo', 'foobar']
+
+
+def _get_memoize_entries(memoize_cache):
+    return set((f, k) for f, memo in memoize_cache._memos.items() for k in memo)
+
+
+def test_session_keeps_results_after_timeout(environment):
+    session = Session(environment=environment)
+    script = session.Script('import json\njson.dumps(1).upper\n')
+    assert [d.name for d in script.infer(1, 8)] == ['json']
+    memoize_cache = session._inference_state.memoize_cache
+    entries = _get_memoize_entries(memoize_cache)
+    assert entries
+
+    script.complete(2, 19, timeout=0)
+    assert script.incomplete
+    # Only results that were calculated after the deadline are removed.
+    assert entries <= _get_memoize_entries(memoize_cache)
+    assert 'upper' in [c.name for c in script.complete(2, 19)]
+
+
+def test_session_keeps_results_after_cancellation(environment):
+    from jedi import CancelledError
+
+    class Token(object):
+        """Is cancelled while inferring."""
+        checks = 0
+
+        @property
+        def cancelled(self):
+            self.checks += 1
+            return self.checks > 3
+
+    session = Session(environment=environment)
+    script = session.Script('import json\njson.dumps(1).upper\n')
+    assert [d.name for d in script.infer(1, 8)] == ['json']
+    memoize_cache = session._inference_state.memoize_cache
+    entries = _get_memoize_entries(memoize_cache)
+
+    with pytest.raises(CancelledError):
+        script.complete(2, 19, cancellation_token=Token())
+    assert entries <= _get_memoize_entries(memoize_cache)
+    assert not memoize_cache._in_progress
+    assert 'upper' in [c.name for c in script.complete(2, 19)]
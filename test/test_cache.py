@@ -1,6 +1,9 @@
 """
 Test all things related to the ``jedi.cache`` module.
 """
+import os
+import time
+from collections import OrderedDict
 
 
 def test_cache_get_signatures(Script):
@@ -27,3 +30,151 @@ def test_cache_get_signatures(Script):
 def test_cache_line_split_issues(Script):
     """Should still work even if there's a newline."""
     assert Script('int(\n').get_signatures()[0].name == 'int'
+
+
+def test_completion_cache_on_disk(tmpdir, monkeypatch, environment):
+    from jedi import Project, Script, settings
+    from jedi.api import completion_cache
+    from jedi.cache import load_from_disk_cache, save_to_disk_cache
+
+    monkeypatch.setattr(settings, 'cache_directory', tmpdir.join('cache').strpath)
+    monkeypatch.setattr(completion_cache, '_cache', OrderedDict())
+    monkeypatch.setattr(completion_cache, '_disk_keys', {})
+    monkeypatch.setattr(completion_cache, '_unsaved', set())
+    package = tmpdir.mkdir('numpy')
+    package.join('__init__.py').write('def array():\n    """Creates an array."""\n')
+    project = Project(tmpdir.strpath)
+
+    def complete():
+        completions = Script('import numpy; numpy.arr', project=project,
+                             environment=environment).complete()
+        assert [c.name for c in completions] == ['array']
+        return completions[0]
+
+    completion = complete()
+    assert completion.type == 'function'
+    assert completion.docstring(raw=True) == 'Creates an array.'
+    disk_key = completion_cache._disk_keys[completion._cached_name]
+    assert package.join('__init__.py').strpath in disk_key
+
+    completion_cache.save_to_disk()
+    entries = load_from_disk_cache('completion', disk_key)
+    assert entries['array'][0] == 'function'
+
+    # Another process loads the entries from disk.
+    entries['array'] = ('class', '', 'From disk')
+    completion_cache._cache.clear()
+    save_to_disk_cache('completion', disk_key, entries)
+    assert complete().type == 'class'
+
+
+def test_completion_cache_dependencies(tmpdir, monkeypatch, environment):
+    from jedi import Project, Script, settings
+    from jedi.api import completion_cache
+
+    monkeypatch.setattr(settings, 'cache_directory', tmpdir.join('cache').strpath)
+    monkeypatch.setattr(completion_cache, '_cache', OrderedDict())
+    monkeypatch.setattr(completion_cache, '_disk_keys', {})
+    monkeypatch.setattr(completion_cache, '_unsaved', set())
+    package = tmpdir.mkdir('numpy')
+    package.join('__init__.py').write('from .core import *\n')
+    core = package.join('core.py')
+    core.write('def array():\n    """Creates an array."""\n')
+    project = Project(tmpdir.strpath)
+
+    def complete():
+        completions = Script('import numpy; numpy.arr', project=project,
+                             environment=environment).complete()
+        assert [c.name for c in completions] == ['array']
+        return completions[0].docstring(raw=True)
+
+    assert complete() == 'Creates an array.'
+    disk_key = list(completion_cache._disk_keys.values())[0]
+    assert core.strpath in disk_key
+
+    # The module itself didn't change, but the module it imports from.
+    core.write('def array():\n    """Creates a new array."""\n')
+    future = time.time() + 100
+    os.utime(core.strpath, (future, future))
+    assert complete() == 'Creates a new array.'
+
+
+def test_completion_cache_module_limit(tmpdir, monkeypatch, environment):
+    from jedi import Project, Script, settings
+    from jedi.api import completion_cache
+    from jedi.cache import load_from_disk_cache
+
+    monkeypatch.setattr(settings, 'cache_directory', tmpdir.join('cache').strpath)
+    monkeypatch.setattr(completion_cache, '_cache', OrderedDict())
+    monkeypatch.setattr(completion_cache, '_disk_keys', {})
+    monkeypatch.setattr(completion_cache, '_unsaved', set())
+    monkeypatch.setattr(completion_cache, '_MODULE_LIMIT', 1)
+    for name in ('numpy', 'pandas'):
+        tmpdir.mkdir(name).join('__init__.py').write('def array(): pass\n')
+    project = Project(tmpdir.strpath)
+
+    def complete(name):
+        completions = Script('import %s; %s.arr' % (name, name), project=project,
+                             environment=environment).complete()
+        assert completions[0].type == 'function'
+
+    complete('numpy')
+    disk_key = list(completion_cache._disk_keys.values())[0]
+    complete('pandas')
+    assert [key[0] for key in completion_cache._cache] == ['pandas']
+    # The removed module was saved.
+    assert load_from_disk_cache('completion', disk_key)['array'][0] == 'function'
+
+
+def test_completion_cache_library_modules(tmpdir, monkeypatch, environment):
+    from jedi import Project, Script
+    from jedi.api import completion_cache
+
+    monkeypatch.setattr(completion_cache, '_cache', OrderedDict())
+    monkeypatch.setattr(completion_cache, '_disk_keys', {})
+    monkeypatch.setattr(completion_cache, '_unsaved', set())
+    project_path = tmpdir.mkdir('proj')
+    project_path.join('own.py').write('def foo(): pass\n')
+    # Starts with the path of the project, but is not in it.
+    library_path = tmpdir.mkdir('proj2')
+    library_path.join('library.py').write('def foo(): pass\n')
+    project = Project(project_path.strpath, added_sys_path=[library_path.strpath])
+
+    def get_cached_modules(code):
+        Script(code, path=project_path.join('test.py').strpath, project=project,
+               environment=environment).complete()
+        return [key[0] for key in completion_cache._cache]
+
+    assert get_cached_modules('import own; own.fo') == []
+    assert get_cached_modules('import library; library.fo') == ['library']
+
+
+def test_memoize_generator_cache_limit(monkeypatch):
+    from jedi import settings
+    from jedi.inference.cache import MemoizeCache, \
+        inference_state_method_generator_cache
+
+    monkeypatch.setattr(settings, 'memoize_cache_size', 1)
+
+    class InferenceState(object):
+        memoize_cache = MemoizeCache(track_dependencies=True)
+
+    class Value(object):
+        inference_state = InferenceState()
+
+        def __init__(self, name):
+            self.name = name
+
+        @inference_state_method_generator_cache()
+        def iterate(self):
+            # Iterating the other value sets its entry, but this entry must
+            # not be evicted, because it prevents the recursion.
+            for element in self.other.iterate():
+                yield element
+            yield self.name
+
+    a = Value('a')
+    b = Value('b')
+    a.other = b
+    b.other = a
+    assert list(a.iterate()) == ['b', 'a']
@@ -181,3 +181,208 @@ def test_operation(Script, inference_state, create_compiled_object):
         right=b,
     )
     assert true.py__name__() == 'bool'
+
+
+def test_prefetch_compiled_names(Script, environment, monkeypatch):
+    if environment.version_info.major == 2:
+        pytest.skip()
+    from jedi.inference.compiled.subprocess import CompiledSubprocess, \
+        InferenceStateSameProcess, functions
+
+    script = Script('import _ctypes; _ctypes.', environment=environment)
+    if isinstance(script._inference_state.compiled_subprocess, InferenceStateSameProcess):
+        pytest.skip("Calls in the same process are not prefetched")
+    send_many = CompiledSubprocess._send_many
+    calls = []
+
+    def send_many_counted(self, requests):
+        calls.extend(function for _, function, _, _ in requests)
+        return send_many(self, requests)
+
+    monkeypatch.setattr(CompiledSubprocess, '_send_many', send_many_counted)
+    completions = script.complete()
+    assert 'Array' in [c.name for c in completions]
+    # Only the parent module is not known by describing its attributes.
+    assert calls.count(functions.get_compiled_method_returns) == 1
+    del calls[:]
+    assert set(c.type for c in completions) >= {'class', 'function'}
+    assert functions.get_compiled_method_return not in calls
+
+
+def test_get_attribute_descriptions(same_process_inference_state):
+    class C(object):
+        x = 1
+
+        @property
+        def prop(self):
+            raise NotImplementedError
+
+        def method(self):
+            pass
+
+    access = DirectObjectAccess(same_process_inference_state, C)
+    needs_type_completions, descriptions = access.get_attribute_descriptions()
+    assert needs_type_completions
+    descriptions = dict((d.name, d) for d in descriptions)
+    assert descriptions['x'].api_type == 'instance'
+    assert descriptions['method'].api_type == 'function'
+    assert descriptions['method'].access_paths[-1].access.py__name__() == 'method'
+
+    prop = descriptions['prop']
+    assert prop.is_descriptor
+    assert prop.access_paths is None
+    assert prop.api_type is None
+
+
+def test_compiled_filter_values_use_descriptions(Script, environment):
+    script = Script('import _ctypes; _ctypes.', environment=environment)
+    module, = script._inference_state.import_module((u'_ctypes',), prefer_stubs=False)
+    filter_, = module.get_filters()
+    names = dict((n.string_name, n) for n in filter_.values())
+    access_handle = module.access_handle
+    assert access_handle._has_cached_result(u'getattr_paths', (u'Array',), {'default': None})
+    assert names['Array'].api_type == 'class'
+
+
+def test_compiled_module_cache(Script, environment, tmpdir, monkeypatch):
+    from jedi import settings
+    from jedi.inference.compiled import access_cache
+    from jedi.inference.compiled.subprocess import CompiledSubprocess, \
+        InferenceStateSameProcess
+
+    monkeypatch.setattr(settings, 'cache_directory', tmpdir.strpath)
+    monkeypatch.setattr(settings, 'save_extension_results', True)
+    monkeypatch.setattr(access_cache, '_calls_cache', {})
+    monkeypatch.setattr(access_cache, '_unsaved', set())
+
+    def complete():
+        script = Script('import _ctypes; _ctypes.Arr', environment=environment)
+        if isinstance(script._inference_state.compiled_subprocess, InferenceStateSameProcess):
+            pytest.skip("Modules in the same process are not cached")
+        return [(c.name, c.type) for c in script.complete()]
+
+    assert complete() == [('Array', 'class')]
+    if not access_cache._unsaved:
+        pytest.skip("_ctypes is not an extension module")
+    access_cache.save_to_disk()
+    assert tmpdir.join('compiled').check()
+
+    monkeypatch.setattr(access_cache, '_calls_cache', {})
+    send_many = CompiledSubprocess._send_many
+    loaded_modules = []
+
+    def send_many_recorded(self, requests):
+        for _, function, _, kwargs in requests:
+            if function is not None and function.__name__ == 'load_module':
+                loaded_modules.append(kwargs['dotted_name'])
+        return send_many(self, requests)
+
+    monkeypatch.setattr(CompiledSubprocess, '_send_many', send_many_recorded)
+    assert complete() == [('Array', 'class')]
+    assert '_ctypes' not in loaded_modules
+
+
+def test_compiled_module_cache_operation(Script, environment, tmpdir, monkeypatch):
+    from jedi import settings
+    from jedi.inference.compiled import access_cache
+
+    monkeypatch.setattr(settings, 'cache_directory', tmpdir.strpath)
+    monkeypatch.setattr(access_cache, '_calls_cache', {})
+    monkeypatch.setattr(access_cache, '_unsaved', set())
+    # Cached handles are sent to the subprocess as arguments.
+    script = Script('import _ctypes\nx = 1 + _ctypes.FUNCFLAG_CDECL\nx',
+                    environment=environment)
+    assert [d.name for d in script.infer(3, 0)] == ['int']
+
+
+def test_compiled_module_cache_exceptions(inference_state, tmpdir, monkeypatch):
+    from jedi import settings
+    from jedi.cache import load_from_disk_cache
+    from jedi.inference.compiled import access_cache
+
+    monkeypatch.setattr(settings, 'cache_directory', tmpdir.strpath)
+    calls = {}
+    monkeypatch.setattr(access_cache, '_calls_cache', {'key': calls})
+    monkeypatch.setattr(access_cache, '_unsaved', set())
+    record = access_cache._ModuleRecord(inference_state, 'key', calls, 'mod', [])
+
+    def raise_(exception):
+        raise exception
+
+    with pytest.raises(MemoryError):
+        record.call((), 'memory', lambda: raise_(MemoryError()))
+    assert not record.has_result((), 'memory')
+
+    error = AttributeError('foo')
+    error.raised_in_subprocess = True
+    with pytest.raises(AttributeError):
+        record.call((), 'attribute', lambda: raise_(error))
+    assert record.has_result((), 'attribute')
+    record.call((), 'value', lambda: 1)
+
+    access_cache.save_to_disk()
+    # Saving on disk is opt-in.
+    assert load_from_disk_cache('compiled', 'key') is None
+
+    monkeypatch.setattr(settings, 'save_extension_results', True)
+    access_cache._unsaved.add('key')
+    access_cache.save_to_disk()
+    assert load_from_disk_cache('compiled', 'key') == {(): {'value': (False, 1)}}
+
+
+def test_compiled_module_cache_limit(tmpdir, monkeypatch):
+    from jedi import settings
+    from jedi.inference.compiled import access_cache
+
+    monkeypatch.setattr(settings, 'cache_directory', tmpdir.strpath)
+    monkeypatch.setattr(settings, 'save_extension_results', True)
+    monkeypatch.setattr(access_cache, '_calls_cache', {})
+    monkeypatch.setattr(access_cache, '_unsaved', set())
+    monkeypatch.setattr(access_cache, '_CALLS_CACHE_LIMIT', 1)
+
+    access_cache._get_calls('first')[()] = {'value': (False, 1)}
+    access_cache._unsaved.add('first')
+    access_cache._get_calls('second')
+    assert list(access_cache._calls_cache) == ['second']
+    # Removed modules are saved before.
+    assert access_cache._get_calls('first') == {(): {'value': (False, 1)}}
+
+
+def test_generated_extension_stubs(Script, environment, tmpdir, monkeypatch):
+    from jedi import settings
+    from jedi.inference.compiled.subprocess import CompiledSubprocess, \
+        InferenceStateSameProcess
+
+    monkeypatch.setattr(settings, 'cache_directory', tmpdir.strpath)
+    monkeypatch.setattr(settings, 'generate_extension_stubs', True)
+    send_many = CompiledSubprocess._send_many
+    functions = []
+
+    def send_many_recorded(self, requests):
+        for _, function, _, kwargs in requests:
+            if function is not None:
+                functions.append((function.__name__, kwargs.get('dotted_name')))
+        return send_many(self, requests)
+
+    monkeypatch.setattr(CompiledSubprocess, '_send_many', send_many_recorded)
+
+    def complete():
+        script = Script('import _ctypes; _ctypes.Arr', environment=environment)
+        if isinstance(script._inference_state.compiled_subprocess, InferenceStateSameProcess):
+            pytest.skip("Modules in the same process are imported anyway")
+        return [(c.name, c.type) for c in script.complete()]
+
+    assert complete() == [('Array', 'class')]
+    if ('generate_stub', '_ctypes') not in functions:
+        pytest.skip("_ctypes is not an extension module")
+    assert ('load_module', '_ctypes') not in functions
+
+    del functions[:]
+    assert complete() == [('Array', 'class')]
+    assert ('generate_stub', '_ctypes') not in functions
+    assert ('load_module', '_ctypes') not in functions
+
+    script = Script('import _ctypes\n_ctypes.sizeof', environment=environment)
+    definition, = script.infer()
+    assert definition.type == 'function'
+    assert 'sizeof(C type) -> integer' in definition.docstring()
@@ -3,6 +3,7 @@ import os
 import pytest
 from parso.utils import PythonVersionInfo
 
+from jedi import settings
 from jedi.inference.gradual import typeshed
 from jedi.inference.value import TreeInstance, BoundMethod, FunctionValue, \
     MethodValue, ClassValue
@@ -42,6 +43,27 @@ def test_get_stub_files():
     assert map_['functools'] == os.path.join(TYPESHED_PYTHON3, 'functools.pyi')
 
 
+def test_stub_file_map_on_disk(tmpdir, monkeypatch):
+    monkeypatch.setattr(settings, 'cache_directory', tmpdir.join('cache').strpath)
+    stubs = tmpdir.mkdir('stubs')
+    stubs.join('foo.pyi').write('')
+    directories = [stubs.strpath]
+
+    map_ = typeshed._load_stub_file_map(directories)
+    assert map_ == {'foo': stubs.join('foo.pyi').strpath}
+
+    # The second time the map is loaded from disk.
+    create_stub_map = typeshed._merge_create_stub_map
+    monkeypatch.setattr(typeshed, '_merge_create_stub_map', None)
+    assert typeshed._load_stub_file_map(directories) == map_
+
+    # Adding a stub changes the modification time of the directory.
+    monkeypatch.setattr(typeshed, '_merge_create_stub_map', create_stub_map)
+    stubs.join('bar.pyi').write('')
+    os.utime(stubs.strpath, (1000, 1000))
+    assert sorted(typeshed._load_stub_file_map(directories)) == ['bar', 'foo']
+
+
 def test_function(Script, environment):
     code = 'import threading; threading.current_thread'
     def_, = Script(code).infer()
@@ -7,12 +7,14 @@ import os
 
 import pytest
 
+from jedi import settings
 from jedi.file_io import FileIO
 from jedi._compatibility import find_module_py33, find_module
 from jedi.inference import compiled
 from jedi.inference import imports
 from jedi.api.project import Project
 from jedi.inference.gradual.conversion import _stub_to_python_value_set
+from jedi.inference import references
 from jedi.inference.references import get_module_contexts_containing_name
 from ..helpers import get_example_dir, test_dir, test_dir_project, root_dir
 
@@ -344,6 +346,102 @@ def test_get_modules_containing_name(inference_state, path, goal, is_package):
     assert found_module.string_names == goal
 
 
+def test_search_in_file_ios_identifier_index(inference_state, tmpdir, monkeypatch):
+    monkeypatch.setattr(settings, 'cache_directory', tmpdir.join('cache').strpath)
+    monkeypatch.setattr(references, '_identifier_index', references._IdentifierIndex())
+    tmpdir.join('first.py').write('foo = 1\n')
+    tmpdir.join('second.py').write('bar = foo\n')
+    file_ios = [FileIO(tmpdir.join(n).strpath) for n in ('first.py', 'second.py')]
+
+    def search(name):
+        modules = references.search_in_file_ios(inference_state, file_ios, name)
+        return [os.path.basename(m.py__file__()) for m in modules]
+
+    assert search('foo') == ['first.py', 'second.py']
+
+    read_files = []
+    read = FileIO.read
+    monkeypatch.setattr(FileIO, 'read', lambda self: read_files.append(self.path) or read(self))
+    # The index is saved when Python exits and a new process loads it.
+    references._identifier_index.save()
+    monkeypatch.setattr(references, '_identifier_index', references._IdentifierIndex())
+    assert search('bar') == ['second.py']
+    assert search('baz') == []
+    assert read_files == [file_ios[1].path]
+
+
+def test_search_in_file_ios_index_limit(inference_state, tmpdir, monkeypatch):
+    monkeypatch.setattr(settings, 'cache_directory', tmpdir.join('cache').strpath)
+    monkeypatch.setattr(references, '_identifier_index', references._IdentifierIndex())
+    monkeypatch.setattr(references, '_OPENED_FILE_LIMIT', 3)
+    names = ['mod%s.py' % i for i in range(4)]
+    for name in names:
+        tmpdir.join(name).write('bar = 1\n')
+    tmpdir.join('last.py').write('foo = 1\n')
+    file_ios = [FileIO(tmpdir.join(n).strpath) for n in names + ['last.py']]
+
+    def search():
+        modules = references.search_in_file_ios(inference_state, file_ios, 'foo')
+        return [os.path.basename(m.py__file__()) for m in modules]
+
+    assert search() == []
+    # Files that are skipped because of the index are not opened and don't
+    # count towards the limit.
+    assert search() == ['last.py']
+
+
+def test_identifier_index_directory_limit(tmpdir, monkeypatch):
+    monkeypatch.setattr(settings, 'cache_directory', tmpdir.join('cache').strpath)
+    monkeypatch.setattr(references, '_IDENTIFIER_INDEX_DIRECTORY_LIMIT', 2)
+    index = references._IdentifierIndex()
+    file_ios = []
+    for name in ('a', 'b', 'c'):
+        tmpdir.mkdir(name).join('mod.py').write('foo = 1\n')
+        file_io = FileIO(tmpdir.join(name, 'mod.py').strpath)
+        index.set(file_io, file_io.get_last_modified(), 'foo = 1\n')
+        file_ios.append(file_io)
+    assert len(index._directories) == 2
+    # The removed directory was saved and is loaded again.
+    assert index.contains(file_ios[0], 'foo') is True
+    assert index.contains(file_ios[0], 'bar') is False
+
+    tmpdir.join('a', 'mod.py').write('bar = 1\n')
+    file_io = FileIO(file_ios[0].path)
+    os.utime(file_io.path, (0, 0))
+    assert index.contains(file_io, 'foo') is None
+    index.set(file_io, file_io.get_last_modified(), 'bar = 1\n')
+    assert index.contains(file_io, 'foo') is False
+    assert index.contains(file_io, 'bar') is True
+
+
+@pytest.mark.parametrize('threads', (1, 2))
+def test_search_in_file_ios_threads(inference_state, tmpdir, monkeypatch, threads):
+    monkeypatch.setattr(settings, 'cache_directory', tmpdir.join('cache').strpath)
+    monkeypatch.setattr(references, '_identifier_index', references._IdentifierIndex())
+    monkeypatch.setattr(references, '_FILE_READER_THREADS', threads)
+    monkeypatch.setattr(references, '_file_reader_executor', None)
+    names = []
+    for i in range(20):
+        name = 'mod%s.py' % i
+        tmpdir.join(name).write('foo = 1\n' if i % 3 else 'bar = 1\n')
+        names.append(name)
+    file_ios = [FileIO(tmpdir.join(n).strpath) for n in names + ['missing.py']]
+
+    modules = references.search_in_file_ios(inference_state, file_ios, 'foo')
+    expected = [n for i, n in enumerate(names) if i % 3]
+    assert [os.path.basename(m.py__file__()) for m in modules] == expected
+
+    # Stopping early must not break anything.
+    modules = references.search_in_file_ios(inference_state, file_ios, 'foo')
+    assert os.path.basename(next(modules).py__file__()) == expected[0]
+    modules.close()
+    # All searches share the same threads.
+    executor = references._file_reader_executor
+    assert (executor is None) == (threads == 1)
+    list(references.search_in_file_ios(inference_state, file_ios, 'bar'))
+    assert references._file_reader_executor is executor
+
+
 @pytest.mark.parametrize(
     'path', ('api/whatever/test_this.py', 'api/whatever/file'))
 @pytest.mark.parametrize('empty_sys_path', (False, True))
@@ -460,6 +558,40 @@ def test_import_needed_modules_by_jedi(Script, environment, tmpdir, name):
     assert module._inference_state.typing_module.py__file__() != module_path
 
 
+def test_module_names_cache(Script, environment, tmpdir):
+    project = Project(tmpdir.strpath, sys_path=[tmpdir.strpath] + environment.get_sys_path())
+
+    def complete():
+        script = Script('import jedi_cached_module_', project=project)
+        return [c.name for c in script.complete()]
+
+    tmpdir.join('jedi_cached_module_a.py').write('')
+    assert complete() == ['jedi_cached_module_a']
+    key = environment.executable, tmpdir.strpath
+    (modified, _), names = imports._module_names_cache[key]
+    assert 'jedi_cached_module_a' in names
+
+    # Adding a file changes the modification time of the directory.
+    tmpdir.join('jedi_cached_module_b.py').write('')
+    os.utime(tmpdir.strpath, (modified + 10, modified + 10))
+    assert complete() == ['jedi_cached_module_a', 'jedi_cached_module_b']
+
+    # A directory becomes a package, but only the directory itself is
+    # modified.
+    package = tmpdir.mkdir('jedi_cached_module_c')
+    os.utime(tmpdir.strpath, (modified + 20, modified + 20))
+    assert complete() == ['jedi_cached_module_a', 'jedi_cached_module_b',
+                          'jedi_cached_module_c']
+    state, _ = imports._module_names_cache[key]
+    package.join('__init__.py').write('')
+    os.utime(package.strpath, (modified + 30, modified + 30))
+    assert complete() == ['jedi_cached_module_a', 'jedi_cached_module_b',
+                          'jedi_cached_module_c']
+    new_state, _ = imports._module_names_cache[key]
+    assert new_state != state
+    assert new_state[1] == ((package.strpath, modified + 30),)
+
+
 def test_import_with_semicolon(Script):
     names = [c.name for c in Script('xzy; from abc import ').complete()]
     assert 'ABCMeta' in names